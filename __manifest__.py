@@ -4,7 +4,8 @@
     "category": "Insurance",
     "summary": "Core Health Insurance Management",
     "author": "Qasim",
-    "depends": ["base", "mail", "account", "web"],
+    "depends": ["base", "mail", "account", "web", "resource"],
+    "external_dependencies": {"python": ["numpy"]},
     "data": [
         # -------------------------
         # SECURITY
@@ -18,12 +19,15 @@
         # -------------------------
         "data/sequence.xml",
         "data/member_sequence.xml",
+        "data/fraud_rules.xml",
+        "data/mail_activity_type.xml",
         # -------------------------
         # CRONS
         # -------------------------
         "data/policy_cron.xml",
         "data/member_cron.xml",
         "data/cron.xml",
+        "data/reinsurance_cron.xml",
         # -------------------------
         # REPORTS
         # -------------------------
@@ -42,9 +46,13 @@
         "views/provider_views.xml",
         "views/coverage_template_views.xml",
         "views/service_views.xml",
+        "views/fraud_rule_views.xml",
+        "views/payment_run_views.xml",
+        "views/reinsurance_simulation_views.xml",
         "views/reinsurance_contract_views.xml",
         "views/reinsurance_bordereau_views.xml",
         "views/reinsurance_bordereau_line_views.xml",
+        "views/reinsurance_bordereau_run_views.xml",
         "views/reinsurance_settlement_views.xml",
         "views/committee_dashboard_views.xml",
         "views/res_company_views.xml",
@@ -52,6 +60,7 @@
         # MENUS ALWAYS LAST
         # -------------------------
         "views/menu.xml",
+        "views/fraud_heatmap_views.xml",
     ],
     "installable": True,
     "application": True,
@@ -0,0 +1 @@
+from . import bordereau_export
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+from odoo import http
+from odoo.http import request
+
+EXPORT_MIMETYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class BordereauExportController(http.Controller):
+    @http.route(
+        "/insurance/reinsurance/bordereau/<int:bordereau_id>/export/<string:file_format>",
+        type="http",
+        auth="user",
+    )
+    def export_bordereau(self, bordereau_id, file_format):
+        """
+        Stream a bordereau to the reinsurer format. The file is written
+        chunk by chunk to a temporary file and sent from disk, so memory
+        stays flat regardless of the number of lines.
+        """
+        if file_format not in EXPORT_MIMETYPES:
+            return request.not_found()
+
+        bordereau = request.env["insurance.reinsurance.bordereau"].browse(bordereau_id)
+        if not bordereau.exists():
+            return request.not_found()
+        bordereau.check_access("read")
+
+        fd, path = tempfile.mkstemp(suffix=f".{file_format}")
+        os.close(fd)
+        try:
+            bordereau._export_lines_to_file(path, file_format)
+        except Exception:
+            os.unlink(path)
+            raise
+
+        stream = http.Stream(
+            type="path",
+            path=path,
+            mimetype=EXPORT_MIMETYPES[file_format],
+            download_name=f"{bordereau.name.replace('/', '-')}.{file_format}",
+            size=os.path.getsize(path),
+        )
+        response = stream.get_response(as_attachment=True)
+        response.call_on_close(lambda: os.unlink(path))
+        return response
@@ -4,15 +4,27 @@ from . import policy_cron
 from . import policy_coverage_line
 from . import member
 from . import member_document
+from . import member_limit_balance
 from . import member_cron
 from . import provider
 from . import claim
+from . import claim_counter
 from . import claim_vote
+from . import committee_stat
+from . import payment_run
+from . import fraud_rule
+from . import fraud_rescore_run
 from . import coverage_template
 from . import coverage_line
+from . import coverage_usage
 from . import reinsurance_contract
+from . import reinsurance_accumulator
+from . import reinsurance_simulation
 from . import res_company
+from . import resource_calendar
 from . import reinsurance_bordereau
 from . import reinsurance_bordereau_line
+from . import reinsurance_bordereau_run
 from . import reinsurance_settlement
+from . import collusion_graph
 from . import fraud_heatmap
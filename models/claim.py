@@ -1,7 +1,31 @@
+import hashlib
+import math
+
+from markupsafe import Markup
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError, AccessError
+from odoo.tools.sql import column_exists, create_column, table_exists
 from datetime import timedelta
 
+from .claim_counter import COUNTER_TRACKED_FIELDS
+from .committee_stat import COMMITTEE_STAT_TRACKED_FIELDS
+
+# Claimed amounts are bucketed into ~5% logarithmic bands for the
+# duplicate fingerprint; neighbouring bands catch near-duplicates.
+FINGERPRINT_BAND_RATIO = 1.05
+FINGERPRINT_BATCH_SIZE = 5000
+
+# Submitted claims within this many hours of their SLA deadline are
+# "Near Breach".
+SLA_WARNING_HOURS = 12
+
+
+def amount_band(amount):
+    if not amount or amount <= 0:
+        return 0
+    return math.floor(math.log(amount) / math.log(FINGERPRINT_BAND_RATIO))
+
 
 class InsuranceClaim(models.Model):
     _name = "insurance.claim"
@@ -104,6 +128,13 @@ class InsuranceClaim(models.Model):
         readonly=True,
     )
 
+    payment_run_id = fields.Many2one(
+        "insurance.payment.run",
+        string="Payment Run",
+        readonly=True,
+        index="btree_not_null",
+    )
+
     payee_type = fields.Selection(
         [
             ("provider", "Medical Provider"),
@@ -141,16 +172,21 @@ class InsuranceClaim(models.Model):
         store=False,
     )
 
+    # Stored so SLA queues are indexed searches; set when the deadline or
+    # state changes and moved forward by cron_update_sla_status.
     sla_status = fields.Selection(
         [
             ("ok", "On Track"),
             ("warning", "Near Breach"),
             ("breached", "Breached"),
         ],
-        compute="_compute_sla_remaining",
-        store=False,
+        compute="_compute_sla_status",
+        store=True,
+        readonly=True,
     )
 
+    _sla_queue_idx = models.Index("(state, sla_status, sla_deadline)")
+
     # -------------------------------------------------
     # WORKFLOW STATE
     # -------------------------------------------------
@@ -240,6 +276,7 @@ class InsuranceClaim(models.Model):
             if not self.env.user.has_group("insurance_core.group_insurance_manager"):
                 raise AccessError("Only managers can return claims.")
 
+            rec._release_annual_limit()
             rec.state = "returned"
 
             rec.message_post(
@@ -251,7 +288,19 @@ class InsuranceClaim(models.Model):
             if rec.state != "returned":
                 raise ValidationError("Only returned claims can be resubmitted.")
 
-            rec.state = "submitted"
+            rec._check_policy_annual_limit()
+
+            # Fresh SLA clock: the old deadline may have passed while the
+            # claim was back with the submitter
+            company = rec.company_id or self.env.company
+            rec.write(
+                {
+                    "sla_deadline": company._get_insurance_sla_deadline(
+                        fields.Datetime.now()
+                    ),
+                    "state": "submitted",
+                }
+            )
 
             rec.message_post(body="🔁 Claim corrected and resubmitted for approval.")
 
@@ -265,17 +314,21 @@ class InsuranceClaim(models.Model):
         for rec in self:
             if not rec.sla_deadline or rec.state != "submitted":
                 rec.sla_remaining_hours = 0
-                rec.sla_status = "ok"
                 continue
 
             delta = rec.sla_deadline - now
-            hours = delta.total_seconds() / 3600
+            rec.sla_remaining_hours = max(delta.total_seconds() / 3600, 0)
 
-            rec.sla_remaining_hours = max(hours, 0)
+    @api.depends("sla_deadline", "state")
+    def _compute_sla_status(self):
+        now = fields.Datetime.now()
 
-            if hours <= 0:
+        for rec in self:
+            if not rec.sla_deadline or rec.state != "submitted":
+                rec.sla_status = "ok"
+            elif rec.sla_deadline <= now:
                 rec.sla_status = "breached"
-            elif hours <= 12:
+            elif rec.sla_deadline <= now + timedelta(hours=SLA_WARNING_HOURS):
                 rec.sla_status = "warning"
             else:
                 rec.sla_status = "ok"
@@ -302,174 +355,255 @@ class InsuranceClaim(models.Model):
         readonly=True,
     )
 
-    # def _evaluate_fraud_risk(self):
-    #     self.ensure_one()
-
-    #     score = 0
-    #     reasons = []
-
-    #     # ---------------------------------
-    #     # R1: High claim vs history
-    #     # ---------------------------------
-    #     avg_claim = (
-    #         self.env["insurance.claim"]
-    #         .search(
-    #             [
-    #                 ("member_id", "=", self.member_id.id),
-    #                 ("state", "=", "approved"),
-    #             ]
-    #         )
-    #         .mapped("approved_amount")
-    #     )
-
-    #     if avg_claim:
-    #         avg_value = sum(avg_claim) / len(avg_claim)
-    #         if self.claimed_amount > avg_value * 3:
-    #             score += 30
-    #             reasons.append("Claim amount unusually high vs member history.")
-
-    #     # ---------------------------------
-    #     # R2: Too many recent claims
-    #     # ---------------------------------
-    #     recent_claims = self.search(
-    #         [
-    #             ("member_id", "=", self.member_id.id),
-    #             ("create_date", ">=", fields.Datetime.now() - timedelta(days=30)),
-    #         ]
-    #     )
-
-    #     if len(recent_claims) >= 5:
-    #         score += 20
-    #         reasons.append("High number of claims in short period.")
-
-    #     # ---------------------------------
-    #     # R3: Same provider + service repetition
-    #     # ---------------------------------
-    #     repeated = self.search(
-    #         [
-    #             ("provider_id", "=", self.provider_id.id),
-    #             ("service_id", "=", self.service_id.id),
-    #             ("member_id", "=", self.member_id.id),
-    #             ("state", "=", "approved"),
-    #         ]
-    #     )
-
-    #     if len(repeated) >= 3:
-    #         score += 25
-    #         reasons.append("Repeated same service with same provider.")
-
-    #     # ---------------------------------
-    #     # R4: Claim shortly after policy start
-    #     # ---------------------------------
-    #     if self.policy_id:
-    #         days_from_start = (fields.Date.today() - self.policy_id.start_date).days
-    #         if days_from_start <= 14:
-    #             score += 15
-    #             reasons.append("Claim submitted shortly after policy start.")
-
-    #     # ---------------------------------
-    #     # APPLY RESULTS
-    #     # ---------------------------------
-    #     self.fraud_score = score
-    #     self.fraud_flag = score >= 40
-    #     self.fraud_reason = "\n".join(reasons)
+    fraud_manual = fields.Boolean(
+        string="Manual Fraud Decision",
+        readonly=True,
+        copy=False,
+        help="Flagged or cleared by an analyst; automatic scoring leaves it alone.",
+    )
+
+    # Keeps the fraud heatmap refresh off the full claims table
+    _fraud_flag_month_idx = models.Index("(create_date) WHERE fraud_flag IS TRUE")
 
     # -------------------------------------------------
-    # FRAUD DETECTION & ESCALATION (AUTHORITATIVE)
+    # DUPLICATE DETECTION
     # -------------------------------------------------
 
-    def _evaluate_fraud_risk(self):
+    service_date = fields.Date(
+        string="Service Date",
+        default=fields.Date.context_today,
+        tracking=True,
+    )
+
+    claim_fingerprint = fields.Char(
+        string="Fingerprint",
+        compute="_compute_claim_fingerprint",
+        store=True,
+        index=True,
+        copy=False,
+        help="Hash of member, provider, service, amount band and service date.",
+    )
+
+    duplicate_of_id = fields.Many2one(
+        "insurance.claim",
+        string="Possible Duplicate Of",
+        readonly=True,
+        copy=False,
+    )
+
+    def _auto_init(self):
+        # Create the new columns up front so installing them on a large
+        # claim table does not compute every row through the ORM:
+        # fingerprints are filled in chunks by the back-fill cron, SLA
+        # statuses and vote tallies by a single UPDATE each.
+        cr = self.env.cr
+        if table_exists(cr, self._table):
+            if not column_exists(cr, self._table, "service_date"):
+                create_column(cr, self._table, "service_date", "date")
+                cr.execute(
+                    f"UPDATE {self._table} SET service_date = create_date::date"
+                )
+            if not column_exists(cr, self._table, "claim_fingerprint"):
+                create_column(cr, self._table, "claim_fingerprint", "varchar")
+            if not column_exists(cr, self._table, "committee_approved_count"):
+                create_column(cr, self._table, "committee_approved_count", "int4")
+                create_column(cr, self._table, "committee_rejected_count", "int4")
+                if table_exists(cr, "insurance_claim_vote"):
+                    cr.execute(
+                        f"""
+                        UPDATE {self._table} c
+                        SET committee_approved_count = v.approved,
+                            committee_rejected_count = v.rejected
+                        FROM (
+                            SELECT claim_id,
+                                   COUNT(*) FILTER (WHERE decision = 'approve') AS approved,
+                                   COUNT(*) FILTER (WHERE decision = 'reject') AS rejected
+                            FROM insurance_claim_vote
+                            GROUP BY claim_id
+                        ) v
+                        WHERE v.claim_id = c.id
+                        """
+                    )
+                cr.execute(
+                    f"""
+                    UPDATE {self._table}
+                    SET committee_approved_count = COALESCE(committee_approved_count, 0),
+                        committee_rejected_count = COALESCE(committee_rejected_count, 0)
+                    """
+                )
+            if not column_exists(cr, self._table, "sla_status"):
+                create_column(cr, self._table, "sla_status", "varchar")
+                cr.execute(
+                    f"""
+                    UPDATE {self._table}
+                    SET sla_status = CASE
+                        WHEN state != 'submitted' OR sla_deadline IS NULL THEN 'ok'
+                        WHEN sla_deadline <= now() at time zone 'UTC' THEN 'breached'
+                        WHEN sla_deadline <= now() at time zone 'UTC'
+                            + %s * interval '1 hour' THEN 'warning'
+                        ELSE 'ok'
+                    END
+                    """,
+                    (SLA_WARNING_HOURS,),
+                )
+        return super()._auto_init()
+
+    def _make_fingerprint(self, band):
         self.ensure_one()
 
-        score = 0
-        reasons = []
+        key = (
+            f"{self.member_id.id}:{self.provider_id.id}:{self.service_id.id}:"
+            f"{band}:{self.service_date}"
+        )
+        return hashlib.sha1(key.encode()).hexdigest()[:20]
 
-        # ---------------------------------
-        # R1: High claim vs history
-        # ---------------------------------
-        avg_claims = (
-            self.env["insurance.claim"]
-            .search(
-                [
-                    ("member_id", "=", self.member_id.id),
-                    ("state", "=", "approved"),
-                ]
+    @api.depends(
+        "member_id", "provider_id", "service_id", "claimed_amount", "service_date"
+    )
+    def _compute_claim_fingerprint(self):
+        for rec in self:
+            if not (
+                rec.member_id and rec.provider_id and rec.service_id and rec.service_date
+            ):
+                rec.claim_fingerprint = False
+                continue
+            rec.claim_fingerprint = rec._make_fingerprint(
+                amount_band(rec.claimed_amount)
             )
-            .mapped("approved_amount")
-        )
 
-        if avg_claims:
-            avg_value = sum(avg_claims) / len(avg_claims)
-            if self.claimed_amount > avg_value * 3:
-                score += 30
-                reasons.append("Claim amount unusually high vs member history.")
+    def _detect_duplicates(self):
+        """
+        Link each claim to an earlier claim with the same fingerprint or
+        one in a neighbouring amount band. One index probe per batch.
+        """
+        probes = {}
+        for rec in self:
+            band = amount_band(rec.claimed_amount)
+            for offset in (0, -1, 1):
+                probes.setdefault(rec._make_fingerprint(band + offset), []).append(rec)
 
-        # ---------------------------------
-        # R2: Too many recent claims
-        # ---------------------------------
-        recent_claims = self.search(
+        candidates = self.search(
             [
-                ("member_id", "=", self.member_id.id),
-                ("create_date", ">=", fields.Datetime.now() - timedelta(days=30)),
-            ]
-        )
+                ("claim_fingerprint", "in", list(probes)),
+                ("state", "!=", "draft"),
+                ("id", "not in", self.ids),
+            ],
+            order="id",
+        ) | self
 
-        if len(recent_claims) >= 5:
-            score += 20
-            reasons.append("High number of claims in short period.")
+        duplicates = {}
+        for candidate in candidates.sorted("id"):
+            for rec in probes.get(candidate.claim_fingerprint, []):
+                if candidate.id < rec.id or candidate not in self:
+                    duplicates.setdefault(rec, candidate)
 
-        # ---------------------------------
-        # R3: Same provider + service repetition
-        # ---------------------------------
-        repeated = self.search(
-            [
-                ("provider_id", "=", self.provider_id.id),
-                ("service_id", "=", self.service_id.id),
-                ("member_id", "=", self.member_id.id),
-                ("state", "=", "approved"),
-            ]
-        )
+        for rec in self:
+            rec.duplicate_of_id = duplicates.get(rec, False)
+
+    @api.model
+    def cron_backfill_claim_fingerprints(self, batch_size=FINGERPRINT_BATCH_SIZE):
+        """
+        Fingerprint claims created before the column existed, one
+        committed chunk at a time.
+        """
+        field = self._fields["claim_fingerprint"]
+        last_id = 0
+
+        while True:
+            claims = self.search(
+                [("claim_fingerprint", "=", False), ("id", ">", last_id)],
+                order="id",
+                limit=batch_size,
+            )
+            if not claims:
+                return
+
+            self.env.add_to_compute(field, claims)
+            claims.flush_recordset(["claim_fingerprint"])
+            self.env.cr.commit()
+
+            last_id = claims[-1].id
+            self.env.invalidate_all()
+
+    # -------------------------------------------------
+    # FRAUD DETECTION & ESCALATION (AUTHORITATIVE)
+    # -------------------------------------------------
 
-        if len(repeated) >= 3:
-            score += 25
-            reasons.append("Repeated same service with same provider.")
-
-        # ---------------------------------
-        # R4: Claim shortly after policy start
-        # ---------------------------------
-        if self.policy_id:
-            days_from_start = (fields.Date.today() - self.policy_id.start_date).days
-            if days_from_start <= 14:
-                score += 15
-                reasons.append("Claim submitted shortly after policy start.")
-
-        # ---------------------------------
-        # APPLY RESULTS
-        # ---------------------------------
-        self.fraud_score = score
-        self.fraud_flag = score >= 40
-        self.fraud_reason = "\n".join(reasons)
+    def _evaluate_fraud_risk(self):
+        """
+        Score the claims against the active fraud rules (one compiled
+        query for the whole batch) and escalate flagged claims.
+        """
+        self._apply_fraud_scores(self._score_fraud_risk())
+
+    def _score_fraud_risk(self):
+        """
+        Compute fraud results without touching the claims.
+        Returns ``{claim_id: (score, flag, reason)}``.
+        """
+        hits = self.env["insurance.fraud.rule"]._evaluate_claims(self)
+
+        results = {}
+        for rec in self:
+            rules = hits[rec.id]
+            company = rec.company_id or self.env.company
+            score = sum(rules.mapped("weight"))
+            results[rec.id] = (
+                score,
+                score >= company.insurance_fraud_flag_threshold,
+                "\n".join(rules.mapped("reason")),
+            )
+        return results
+
+    def _apply_fraud_scores(self, results):
+        """
+        Store fraud results with one write per distinct result and
+        escalate newly flagged claims as a single batch. Claims with a
+        manual fraud decision keep it.
+        """
+        groups = {}
+        for rec in self.filtered(lambda c: not c.fraud_manual):
+            groups.setdefault(results[rec.id], self.browse())
+            groups[results[rec.id]] |= rec
+
+        for (score, flag, reason), claims in groups.items():
+            claims.write(
+                {
+                    "fraud_score": score,
+                    "fraud_flag": flag,
+                    "fraud_reason": reason,
+                }
+            )
 
         # 🚨 AUTHORITATIVE RULE 🚨
         # Fraud ALWAYS escalates to committee
-        if self.fraud_flag:
-            self._force_committee_escalation()
+        self.filtered(
+            lambda c: c.fraud_flag and c.escalation_level != "committee"
+        )._force_committee_escalation()
 
     def _force_committee_escalation(self):
         """
         Single source of truth for committee escalation.
         """
-        self.ensure_one()
+        if not self:
+            return
 
-        self.escalation_level = "committee"
-        self.committee_required = True
+        self.write(
+            {
+                "escalation_level": "committee",
+                "committee_required": True,
+            }
+        )
 
-        self.message_post(
-            body=(
-                "⚠️ <b>Fraud Risk Detected</b><br/>"
-                f"Score: {self.fraud_score}<br/>"
-                "Claim has been escalated to the Medical Committee."
-            )
+        self._message_log_batch(
+            bodies={
+                rec.id: (
+                    "⚠️ <b>Fraud Risk Detected</b><br/>"
+                    f"Score: {rec.fraud_score}<br/>"
+                    "Claim has been escalated to the Medical Committee."
+                )
+                for rec in self
+            }
         )
 
     def action_flag_fraud(self):
@@ -477,6 +611,7 @@ class InsuranceClaim(models.Model):
             rec.fraud_flag = True
             rec.fraud_reason = (rec.fraud_reason or "") + "\nManually flagged."
             rec.fraud_score = max(rec.fraud_score, 50)
+            rec.fraud_manual = True
 
     # -------------------------------------------------
     # FRAUD ACTIONS
@@ -490,6 +625,7 @@ class InsuranceClaim(models.Model):
             rec.fraud_flag = False
             rec.fraud_score = 0
             rec.fraud_reason = False
+            rec.fraud_manual = True
 
     # -------------------------------------------------
     # ESCALATION MATRIX
@@ -564,6 +700,17 @@ class InsuranceClaim(models.Model):
         readonly=True,
     )
 
+    submitted_date = fields.Datetime(
+        string="Submitted On",
+        readonly=True,
+    )
+
+    decided_date = fields.Datetime(
+        string="Decided On",
+        readonly=True,
+        help="When the claim was approved or rejected.",
+    )
+
     # -------------------------------------------------
     # SLA
     # -------------------------------------------------
@@ -578,8 +725,12 @@ class InsuranceClaim(models.Model):
         string="Overdue",
         compute="_compute_is_overdue",
         store=True,
+        readonly=False,
     )
 
+    # Deadline scheduler scan: submitted, not yet overdue claims by deadline
+    _overdue_scan_idx = models.Index("(state, is_overdue, sla_deadline)")
+
     # -------------------------------------------------
     # COMPUTES
     # -------------------------------------------------
@@ -608,12 +759,9 @@ class InsuranceClaim(models.Model):
     def _committee_vote_summary(self):
         self.ensure_one()
 
-        approvals = self.vote_ids.filtered(lambda v: v.decision == "approve")
-        rejections = self.vote_ids.filtered(lambda v: v.decision == "reject")
-
         return {
-            "approved": len(approvals),
-            "rejected": len(rejections),
+            "approved": self.committee_approved_count,
+            "rejected": self.committee_rejected_count,
         }
 
     # -------------------------------------------------
@@ -629,37 +777,47 @@ class InsuranceClaim(models.Model):
             rec._committee_vote_internal("reject")
 
     def _evaluate_committee_result(self):
-        self.ensure_one()
+        """
+        Decide every claim that reached quorum; committee activities of
+        all decided claims are closed in one pass.
+        """
+        approved = self.filtered(
+            lambda c: c.committee_approved_count >= c.committee_quorum
+        )
+        rejected = (self - approved).filtered(
+            lambda c: c.committee_rejected_count >= c.committee_quorum
+        )
 
-        summary = self._committee_vote_summary()
+        (approved | rejected)._close_committee_activities()
 
-        if summary["approved"] >= self.committee_quorum:
-            self._close_committee_activities()
-            self._finalize_committee_approval()
-            return
+        for rec in approved:
+            rec._finalize_committee_approval()
 
-        if summary["rejected"] >= self.committee_quorum:
-            self._close_committee_activities()
-            self.state = "rejected"
+        if rejected:
+            rejected._release_annual_limit()
+            rejected.write({"state": "rejected"})
 
     def _close_committee_activities(self):
         """
-        Auto-close all pending committee activities
-        once quorum is reached.
+        Mark done the committee review activities of these claims: one
+        search, then one batched done action. Other activities are left
+        alone.
         """
         activities = self.env["mail.activity"].search(
             [
-                ("res_model", "=", "insurance.claim"),
-                ("res_id", "=", self.id),
+                ("res_model", "=", self._name),
+                ("res_id", "in", self.ids),
                 (
                     "activity_type_id",
                     "=",
-                    self.env.ref("mail.mail_activity_data_todo").id,
+                    self.env.ref("insurance_core.mail_activity_type_committee_review").id,
                 ),
             ]
         )
 
-        activities.action_done()
+        # Posts the done messages and, as the type keeps done
+        # activities, archives them rather than deleting
+        activities.action_feedback(feedback="Medical Committee decision reached.")
 
     def _finalize_committee_approval(self):
         self.ensure_one()
@@ -709,30 +867,83 @@ class InsuranceClaim(models.Model):
     # COVERAGE UTILIZATION
     # -------------------------------------------------
     def _update_coverage_utilization(self, amount):
+        """
+        Record usage as the claim's own counter row; concurrent approvals
+        never write the same row.
+        """
         self.ensure_one()
 
         coverage = self._get_coverage_line()
         if not coverage:
             return
 
-        coverage.used_amount += amount
+        self.env["insurance.coverage.usage"].sudo().create(
+            {
+                "claim_id": self.id,
+                "coverage_line_id": coverage.id,
+                "member_id": self.member_id.id,
+                "service_id": self.service_id.id,
+                "period_year": (self.approved_date or fields.Datetime.now()).year,
+                "amount": amount,
+            }
+        )
 
     def _reverse_coverage_utilization(self):
         self.ensure_one()
 
-        coverage = self._get_coverage_line()
-        if not coverage:
-            return
-
-        coverage.used_amount = max(
-            coverage.used_amount - (self.approved_amount or 0.0), 0.0
-        )
+        self.env["insurance.coverage.usage"].sudo().search(
+            [("claim_id", "=", self.id)]
+        ).unlink()
 
     # -------------------------------------------------
-    # POLICY LIMIT CHECK
+    # POLICY LIMIT RESERVATION
     # -------------------------------------------------
 
+    limit_balance_id = fields.Many2one(
+        "insurance.member.limit.balance",
+        string="Annual Limit Balance",
+        readonly=True,
+        copy=False,
+    )
+
+    limit_reserved_amount = fields.Float(
+        string="Reserved Against Annual Limit",
+        readonly=True,
+        copy=False,
+    )
+
+    def _get_limit_year_start(self):
+        """Start of the policy year the claim's service falls in."""
+        self.ensure_one()
+        return self.policy_id._get_policy_year_start(
+            self.service_date or fields.Date.to_date(self.create_date)
+        )
+
+    def _get_limit_balance(self):
+        """
+        The claim's balance row. Claims approved before balances existed
+        have none; their amount was seeded into their service year's
+        row, so that row is resolved and linked here.
+        """
+        self.ensure_one()
+        balance = self.limit_balance_id.sudo()
+        if not balance:
+            balance = self.env["insurance.member.limit.balance"].sudo()._get_balance(
+                self.member_id, self.policy_id, self._get_limit_year_start()
+            )
+            self.limit_balance_id = balance.id
+        return balance
+
     def _check_policy_annual_limit(self):
+        """
+        Reserve each claim's amount against the member's policy-year
+        balance. Balances are locked in id order for the duration of the
+        check, so parallel submissions for the same member cannot both
+        pass the limit.
+        """
+        Balance = self.env["insurance.member.limit.balance"].sudo()
+
+        requested = {}
         for rec in self:
             policy = rec.policy_id
             if not policy:
@@ -741,7 +952,21 @@ class InsuranceClaim(models.Model):
             if policy.state != "active":
                 raise ValidationError("The linked policy is not active.")
 
-            projected_total = rec.member_id.total_claimed + rec.claimed_amount
+            balance = Balance._get_balance(
+                rec.member_id, policy, rec._get_limit_year_start()
+            )
+            rec.limit_balance_id = balance.id
+            requested[balance] = requested.get(balance, 0.0) + rec.claimed_amount
+
+        balances = Balance.browse(sorted(b.id for b in requested))
+        balances._lock_for_update()
+
+        for balance in balances:
+            amount = requested[balance]
+            policy = balance.policy_id
+            projected_total = (
+                balance.consumed_amount + balance.reserved_amount + amount
+            )
 
             if projected_total > policy.annual_limit:
                 raise ValidationError(
@@ -749,22 +974,60 @@ class InsuranceClaim(models.Model):
                         "Annual policy limit exceeded.\n\n"
                         "Policy limit: %.2f\n"
                         "Already claimed: %.2f\n"
+                        "Reserved by pending claims: %.2f\n"
                         "This claim: %.2f\n"
                         "Projected total: %.2f"
                     )
                     % (
                         policy.annual_limit,
-                        rec.member_id.total_claimed,
-                        rec.claimed_amount,
+                        balance.consumed_amount,
+                        balance.reserved_amount,
+                        amount,
                         projected_total,
                     )
                 )
 
+            balance._adjust(reserved_delta=amount)
+
+        for rec in self:
+            rec.limit_reserved_amount = rec.claimed_amount
+
+    def _consume_annual_limit(self):
+        """
+        Convert the submit-time reservation into consumption of the
+        approved amount.
+        """
+        for rec in self:
+            balance = rec._get_limit_balance()
+            balance._adjust(
+                reserved_delta=-(rec.limit_reserved_amount or 0.0),
+                consumed_delta=rec.approved_amount or 0.0,
+            )
+            rec.limit_reserved_amount = 0.0
+
+    def _release_annual_limit(self):
+        """
+        Give back whatever the claim holds on its balance: the pending
+        reservation, or the consumed amount of an approved claim.
+        """
+        for rec in self:
+            if rec.state == "approved":
+                rec._get_limit_balance()._adjust(
+                    consumed_delta=-(rec.approved_amount or 0.0)
+                )
+            elif rec.limit_reserved_amount and rec.limit_balance_id:
+                rec.limit_balance_id.sudo()._adjust(
+                    reserved_delta=-rec.limit_reserved_amount
+                )
+
+            rec.limit_reserved_amount = 0.0
+
     # -------------------------------------------------
     # ACTIONS
     # -------------------------------------------------
     def action_submit(self):
         Attachment = self.env["ir.attachment"]
+        submitted = self.browse()
 
         for rec in self:
             if rec.state != "draft":
@@ -788,89 +1051,232 @@ class InsuranceClaim(models.Model):
             if not rec.policy_id.manager_approval_limit:
                 raise ValidationError("Policy approval limits are not configured.")
 
-            rec._check_policy_annual_limit()
-
             coverage = rec._get_coverage_line()
             if not coverage:
                 raise ValidationError(
                     f"The service '{rec.service_id.name}' is not covered by this policy."
                 )
 
-            if coverage.annual_limit and coverage.remaining_amount <= 0:
+            if (
+                coverage.annual_limit
+                and coverage._get_member_remaining_amount(rec.member_id) <= 0
+            ):
                 raise ValidationError(
                     "This service has no remaining coverage for the current year."
                 )
 
-            # --------------------------------
-            # FRAUD EVALUATION (DO NOT BLOCK)
-            # --------------------------------
-            rec._evaluate_fraud_risk()
+            submitted |= rec
+
+        submitted._detect_duplicates()
 
+        # --------------------------------
+        # FRAUD EVALUATION (DO NOT BLOCK)
+        # One compiled rule query for the whole batch
+        # --------------------------------
+        submitted._evaluate_fraud_risk()
+
+        # One SLA deadline per company for the whole batch
+        now = fields.Datetime.now()
+        deadlines = {}
+
+        for rec in submitted:
             # --------------------------------
             # NORMAL ESCALATION LOGIC
             # --------------------------------
             rec._escalate_if_needed()
 
             # --------------------------------
-            # SLA + SUBMIT
+            # SLA + SUBMIT (working hours of the company calendar)
             # --------------------------------
-            rec.sla_deadline = fields.Datetime.now() + timedelta(hours=48)
-            rec.state = "submitted"
+            company = rec.company_id or self.env.company
+            if company not in deadlines:
+                deadlines[company] = company._get_insurance_sla_deadline(now)
+
+            rec.write(
+                {
+                    "sla_deadline": deadlines[company],
+                    "submitted_date": now,
+                    "state": "submitted",
+                }
+            )
 
-            # --------------------------------
-            # COMMITTEE NOTIFICATION (ONLY IF NEEDED)
-            # --------------------------------
-            if rec.committee_required:
-                rec._notify_committee()
+        # --------------------------------
+        # COMMITTEE NOTIFICATION (ONLY IF NEEDED, ONE BATCH)
+        # --------------------------------
+        submitted.filtered("committee_required")._notify_committee()
+
+        # --------------------------------
+        # ANNUAL LIMIT RESERVATION
+        # Done last so the balance row locks are held as briefly as possible
+        # --------------------------------
+        submitted._check_policy_annual_limit()
 
     committee_approved_count = fields.Integer(
-        compute="_compute_committee_votes", store=False
+        compute="_compute_committee_votes", store=True
     )
 
     committee_rejected_count = fields.Integer(
-        compute="_compute_committee_votes", store=False
+        compute="_compute_committee_votes", store=True
     )
 
     committee_has_voted = fields.Boolean(
-        compute="_compute_committee_votes", store=False
+        compute="_compute_committee_has_voted",
+        search="_search_committee_has_voted",
+    )
+
+    # Committee work queue: open committee claims only
+    _committee_queue_idx = models.Index(
+        "(id) WHERE state = 'submitted' AND committee_required IS TRUE"
     )
 
+    @api.depends("vote_ids.decision")
     def _compute_committee_votes(self):
+        counts = {
+            (claim.id, decision): count
+            for claim, decision, count in self.env["insurance.claim.vote"]._read_group(
+                [("claim_id", "in", self._origin.ids)],
+                ["claim_id", "decision"],
+                ["__count"],
+            )
+        }
+
         for rec in self:
-            approvals = rec.vote_ids.filtered(lambda v: v.decision == "approve")
-            rejections = rec.vote_ids.filtered(lambda v: v.decision == "reject")
+            rec.committee_approved_count = counts.get((rec._origin.id, "approve"), 0)
+            rec.committee_rejected_count = counts.get((rec._origin.id, "reject"), 0)
 
-            rec.committee_approved_count = len(approvals)
-            rec.committee_rejected_count = len(rejections)
-            rec.committee_has_voted = any(
-                v.user_id == self.env.user for v in rec.vote_ids
+    def _compute_committee_has_voted(self):
+        voted = set(
+            self.env["insurance.claim.vote"]
+            .search(
+                [
+                    ("claim_id", "in", self._origin.ids),
+                    ("user_id", "=", self.env.uid),
+                ]
             )
+            .claim_id.ids
+        )
+
+        for rec in self:
+            rec.committee_has_voted = rec._origin.id in voted
+
+    def _search_committee_has_voted(self, operator, value):
+        if operator in ("in", "not in"):
+            voted = (True in value) == (operator == "in")
+        else:
+            voted = bool(value) == (operator == "=")
+
+        if voted:
+            return [("vote_ids.user_id", "=", self.env.uid)]
+        # Anti-join on the (claim_id, user_id) unique index
+        return [("vote_ids", "not any", [("user_id", "=", self.env.uid)])]
+
+    committee_digest_pending = fields.Boolean(
+        string="Pending Committee Digest",
+        readonly=True,
+        copy=False,
+    )
+
+    _committee_digest_idx = models.Index(
+        "(company_id) WHERE committee_digest_pending IS TRUE"
+    )
 
     def _notify_committee(self):
         """
-        Notify all Medical Committee members that a claim
-        requires committee review.
+        Notify all Medical Committee members that the claims
+        require committee review: one activity per member and claim,
+        created in a single batch, or a queued entry for the company's
+        periodic digest when digest mode is enabled.
         """
-        self.ensure_one()
-
         committee_group = self.env.ref(
             "insurance_core.group_insurance_committee", raise_if_not_found=False
         )
 
-        if not committee_group:
+        if not committee_group or not self:
             return
 
-        for user in committee_group.user_ids:
-            self.activity_schedule(
-                "mail.mail_activity_data_todo",
-                user_id=user.id,
-                summary="Medical Committee Review Required",
-                note=(
-                    f"Claim {self.name} requires Medical Committee review.\n\n"
-                    f"Fraud Score: {self.fraud_score}\n"
-                    f"Claimed Amount: {self.claimed_amount}"
-                ),
+        digest = self.filtered(
+            lambda c: (c.company_id or self.env.company).insurance_committee_digest
+        )
+        digest.write({"committee_digest_pending": True})
+
+        immediate = self - digest
+        if not immediate:
+            return
+
+        model_id = self.env["ir.model"]._get_id(self._name)
+        activity_type = self.env.ref(
+            "insurance_core.mail_activity_type_committee_review"
+        )
+        today = fields.Date.context_today(self)
+
+        self.env["mail.activity"].create(
+            [
+                {
+                    "res_model_id": model_id,
+                    "res_id": rec.id,
+                    "activity_type_id": activity_type.id,
+                    "user_id": user.id,
+                    "date_deadline": today,
+                    "summary": "Medical Committee Review Required",
+                    "note": (
+                        f"Claim {rec.name} requires Medical Committee review.\n\n"
+                        f"Fraud Score: {rec.fraud_score}\n"
+                        f"Claimed Amount: {rec.claimed_amount}"
+                    ),
+                }
+                for rec in immediate
+                for user in committee_group.user_ids
+            ]
+        )
+
+    @api.model
+    def cron_send_committee_digest(self):
+        """
+        Send each committee member one mail per company listing the
+        claims queued for review since the previous digest.
+        """
+        committee_group = self.env.ref(
+            "insurance_core.group_insurance_committee", raise_if_not_found=False
+        )
+        pending = self.search(
+            [("committee_digest_pending", "=", True)],
+            order="company_id, id",
+        )
+        open_claims = pending.filtered(lambda c: c.state == "submitted")
+        if not committee_group:
+            open_claims = self.browse()
+
+        mails = []
+        for company, claims in open_claims.grouped("company_id").items():
+            rows = Markup().join(
+                Markup("<li>{} — {} — Claimed {} — Fraud Score {}</li>").format(
+                    claim.name,
+                    claim.member_id.name,
+                    claim.claimed_amount,
+                    claim.fraud_score,
+                )
+                for claim in claims
             )
+            body = Markup(
+                "<p>{} claim(s) require Medical Committee review:</p><ul>{}</ul>"
+            ).format(len(claims), rows)
+
+            users = committee_group.user_ids.filtered(
+                lambda u: not company or company in u.company_ids
+            )
+            mails += [
+                {
+                    "subject": f"Medical Committee Digest: {len(claims)} new claim(s)",
+                    "body_html": body,
+                    "email_from": (company or self.env.company).email_formatted,
+                    "recipient_ids": [(4, user.partner_id.id)],
+                    "auto_delete": True,
+                }
+                for user in users
+            ]
+
+        self.env["mail.mail"].sudo().create(mails)
+        pending.write({"committee_digest_pending": False})
 
     def action_approve(self):
         for rec in self:
@@ -929,22 +1335,8 @@ class InsuranceClaim(models.Model):
             # --------------------------------
             # ANNUAL SERVICE LIMIT
             # --------------------------------
-            year_start = fields.Date.to_date(f"{fields.Date.today().year}-01-01")
-            year_end = fields.Date.to_date(f"{fields.Date.today().year}-12-31")
-
-            previous_claims = self.search(
-                [
-                    ("member_id", "=", rec.member_id.id),
-                    ("service_id", "=", rec.service_id.id),
-                    ("state", "=", "approved"),
-                    ("approved_date", ">=", year_start),
-                    ("approved_date", "<=", year_end),
-                ]
-            )
-
-            already_used = sum(previous_claims.mapped("approved_amount"))
-
             if coverage.annual_limit:
+                already_used = coverage._get_member_used_amount(rec.member_id)
                 remaining = coverage.annual_limit - already_used
                 if remaining <= 0:
                     raise ValidationError(
@@ -962,19 +1354,13 @@ class InsuranceClaim(models.Model):
             # --------------------------------
             # REINSURANCE
             # --------------------------------
+            rec.ceded_base_amount = insurer_share
+
             reinsurance = rec._get_reinsurance_contract()
             if reinsurance:
-                retention = reinsurance.retention_amount
-
-                if insurer_share > retention:
-                    reinsurer_share = insurer_share - retention
-                    insurer_share = retention
-
-                if reinsurance.max_coverage_amount:
-                    reinsurer_share = min(
-                        reinsurer_share, reinsurance.max_coverage_amount
-                    )
-
+                insurer_share, reinsurer_share = reinsurance._cede_claim_amount(
+                    insurer_share, fields.Date.today().year
+                )
                 rec.reinsurance_contract_id = reinsurance.id
 
             # --------------------------------
@@ -987,13 +1373,14 @@ class InsuranceClaim(models.Model):
             rec.approved_date = fields.Datetime.now()
             # AUTO-CREATE ACCOUNTING ENTRY
             rec._create_accounting_entry()
+            rec._consume_annual_limit()
             rec.state = "approved"
             # rec._create_payment()
 
             # --------------------------------
             # UTILIZATION
             # --------------------------------
-            rec._update_coverage_utilization(insurer_share)
+            rec._update_coverage_utilization(rec.approved_amount)
 
     @api.model
     def create(self, vals_list):
@@ -1007,7 +1394,58 @@ class InsuranceClaim(models.Model):
                     self.env["ir.sequence"].next_by_code("insurance.claim") or "New"
                 )
 
-        return super().create(vals_list)
+        records = super().create(vals_list)
+
+        Counter = self.env["insurance.claim.counter"]
+        Counter._apply(added=Counter._get_claim_contributions(records))
+
+        Stat = self.env["insurance.committee.stat"]
+        Stat._apply(added=Stat._get_claim_contributions(records))
+
+        return records
+
+    def write(self, vals):
+        if vals.get("state") in ("approved", "rejected") and "decided_date" not in vals:
+            vals = dict(vals, decided_date=fields.Datetime.now())
+
+        # Keep the velocity counters in step with member/provider/service
+        # and approval changes, and the committee snapshot with case moves
+        track_counters = bool(COUNTER_TRACKED_FIELDS.intersection(vals))
+        track_stats = bool(COMMITTEE_STAT_TRACKED_FIELDS.intersection(vals))
+        if not (track_counters or track_stats):
+            return super().write(vals)
+
+        Counter = self.env["insurance.claim.counter"]
+        Stat = self.env["insurance.committee.stat"]
+        counters_before = Counter._get_claim_contributions(self) if track_counters else []
+        stats_before = Stat._get_claim_contributions(self) if track_stats else []
+
+        res = super().write(vals)
+
+        if track_counters:
+            Counter._apply(
+                added=Counter._get_claim_contributions(self), removed=counters_before
+            )
+        if track_stats:
+            Stat._apply(added=Stat._get_claim_contributions(self), removed=stats_before)
+        return res
+
+    def unlink(self):
+        # A deleted claim must not keep holding its annual limit
+        self.filtered(
+            lambda c: c.state == "approved" or c.limit_reserved_amount
+        )._release_annual_limit()
+
+        Counter = self.env["insurance.claim.counter"]
+        Counter._apply(removed=Counter._get_claim_contributions(self))
+
+        # Votes go with their claim through the database cascade
+        Stat = self.env["insurance.committee.stat"]
+        Stat._apply(
+            removed=Stat._get_claim_contributions(self)
+            + Stat._get_vote_contributions(self.vote_ids)
+        )
+        return super().unlink()
 
     # --------------------------------------------------
     # JOURNAL HELPER
@@ -1206,8 +1644,7 @@ class InsuranceClaim(models.Model):
         if self.state != "submitted" or not self.committee_required:
             raise ValidationError("This claim is not under committee review.")
 
-        existing = self.vote_ids.filtered(lambda v: v.user_id == user)
-        if existing:
+        if self.committee_has_voted:
             raise ValidationError("You have already voted on this claim.")
 
         self.env["insurance.claim.vote"].create(
@@ -1233,6 +1670,8 @@ class InsuranceClaim(models.Model):
 
             if rec.state == "approved":
                 rec._reverse_coverage_utilization()
+                if rec.reinsurance_contract_id:
+                    rec.reinsurance_contract_id._release_claim_cession(rec)
 
             if rec.payment_state == "paid":
                 raise ValidationError(
@@ -1240,6 +1679,7 @@ class InsuranceClaim(models.Model):
                     "Please reverse the payment before rejecting."
                 )
 
+            rec._release_annual_limit()
             rec.state = "rejected"
 
     # -------------------------------------------------
@@ -1247,15 +1687,88 @@ class InsuranceClaim(models.Model):
     # -------------------------------------------------
 
     @api.model
-    def cron_update_overdue_claims(self):
+    def cron_update_sla_status(self):
+        """
+        Move submitted claims ok -> warning -> breached with one bulk
+        write per transition, then schedule the next run for the next
+        claim due to change.
+        """
         now = fields.Datetime.now()
+        warning_from = now + timedelta(hours=SLA_WARNING_HOURS)
+
+        self.search(
+            [
+                ("state", "=", "submitted"),
+                ("sla_status", "!=", "breached"),
+                ("sla_deadline", "<=", now),
+            ]
+        ).write({"sla_status": "breached"})
+
+        self.search(
+            [
+                ("state", "=", "submitted"),
+                ("sla_status", "=", "ok"),
+                ("sla_deadline", "<=", warning_from),
+            ]
+        ).write({"sla_status": "warning"})
+
+        next_warning = self.search(
+            [("state", "=", "submitted"), ("sla_status", "=", "ok")],
+            order="sla_deadline",
+            limit=1,
+        ).sla_deadline
+        next_breach = self.search(
+            [("state", "=", "submitted"), ("sla_status", "=", "warning")],
+            order="sla_deadline",
+            limit=1,
+        ).sla_deadline
+
+        upcoming = [
+            moment
+            for moment in (
+                next_warning and next_warning - timedelta(hours=SLA_WARNING_HOURS),
+                next_breach,
+            )
+            if moment
+        ]
+        if upcoming:
+            self.env.ref("insurance_core.ir_cron_update_sla_status")._trigger(
+                max(min(upcoming), now)
+            )
+
+    @api.model
+    def cron_update_overdue_claims(self):
+        """
+        Deadline scheduler. Submitted claims past their SLA deadline and
+        not yet marked overdue are marked and moved to the committee in
+        one bulk write; the (state, is_overdue, sla_deadline) index keeps
+        the scan to exactly those claims.
+        """
         claims = self.search(
             [
                 ("state", "=", "submitted"),
-                ("sla_deadline", "<", now),
+                ("is_overdue", "=", False),
+                ("sla_deadline", "<=", fields.Datetime.now()),
             ]
         )
-        claims._compute_is_overdue()
+        newly_escalated = claims.filtered(lambda c: not c.committee_required)
+
+        claims.write(
+            {
+                "is_overdue": True,
+                "escalation_level": "committee",
+                "committee_required": True,
+            }
+        )
+
+        if newly_escalated:
+            newly_escalated._message_log_batch(
+                bodies=dict.fromkeys(
+                    newly_escalated.ids,
+                    "⏰ SLA deadline passed. Claim escalated to the Medical Committee.",
+                )
+            )
+            newly_escalated._notify_committee()
 
     # ---------------------------------
     # REINSURANCE SPLIT
@@ -1265,6 +1778,12 @@ class InsuranceClaim(models.Model):
 
     reinsurer_share = fields.Float(string="Reinsurer Share", readonly=True)
 
+    ceded_base_amount = fields.Float(
+        string="Insurer Amount Before Reinsurance",
+        readonly=True,
+        copy=False,
+    )
+
     reinsurance_contract_id = fields.Many2one(
         "insurance.reinsurance.contract", string="Reinsurance Contract", readonly=True
     )
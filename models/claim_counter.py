@@ -0,0 +1,209 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+# Counter key per grouping: a Python template filled from claim ids and
+# the SQL expression building the same key from a claim row aliased "b".
+COUNTER_KEYS = {
+    "member": (
+        "member:{member_id}",
+        "'member:' || b.member_id",
+    ),
+    "provider": (
+        "provider:{provider_id}",
+        "'provider:' || b.provider_id",
+    ),
+    "provider_service": (
+        "ps:{provider_id}:{service_id}",
+        "'ps:' || b.provider_id || ':' || b.service_id",
+    ),
+    "member_provider_service": (
+        "mps:{member_id}:{provider_id}:{service_id}",
+        "'mps:' || b.member_id || ':' || b.provider_id || ':' || b.service_id",
+    ),
+}
+
+# Claim fields that move a claim between counter rows
+COUNTER_TRACKED_FIELDS = {
+    "member_id",
+    "provider_id",
+    "service_id",
+    "state",
+    "approved_amount",
+    "submitted_date",
+    "approved_date",
+}
+
+
+class InsuranceClaimCounter(models.Model):
+    """
+    Rolling per-day claim counters.
+
+    Counts are keyed by grouping key (member, provider, provider +
+    service, member + provider + service) and event day: claims count on
+    the day they were submitted (created, while still a draft), approvals
+    on the day they were approved. An N-day velocity check sums the rows
+    of one key within the window instead of scanning the claim history.
+
+    Rows are append-only deltas: claim create, write and unlink only
+    ever INSERT, so parallel submissions to one hospital never update a
+    shared row. A daily cron compacts each key and day back to one row.
+    """
+
+    _name = "insurance.claim.counter"
+    _description = "Claim Velocity Counter"
+    _order = "day desc, key"
+
+    key = fields.Char(required=True, readonly=True)
+
+    day = fields.Date(required=True, readonly=True)
+
+    claim_count = fields.Integer(
+        string="Claims",
+        readonly=True,
+    )
+
+    approved_count = fields.Integer(
+        string="Approved Claims",
+        readonly=True,
+    )
+
+    approved_amount = fields.Float(
+        string="Approved Amount",
+        readonly=True,
+    )
+
+    _key_day_idx = models.Index("(key, day)")
+
+    def init(self):
+        # Seed from existing claims once; later changes are deltas
+        cr = self.env.cr
+        cr.execute("SELECT 1 FROM insurance_claim_counter LIMIT 1")
+        if cr.fetchone():
+            return
+
+        keys = " UNION ALL ".join(
+            f"SELECT {sql_key} AS key, b.* FROM insurance_claim b"
+            for _template, sql_key in COUNTER_KEYS.values()
+        )
+        cr.execute(
+            f"""
+            INSERT INTO insurance_claim_counter (
+                key, day, claim_count, approved_count, approved_amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                e.key, e.day,
+                SUM(e.claims), SUM(e.approved), SUM(e.amount),
+                1, now() at time zone 'UTC', 1, now() at time zone 'UTC'
+            FROM (
+                SELECT c.key, COALESCE(c.submitted_date, c.create_date)::date AS day,
+                       1 AS claims, 0 AS approved, 0.0 AS amount
+                FROM ({keys}) c
+                UNION ALL
+                SELECT c.key, COALESCE(c.approved_date, c.create_date)::date,
+                       0, 1, COALESCE(c.approved_amount, 0.0)
+                FROM ({keys}) c
+                WHERE c.state = 'approved'
+            ) e
+            GROUP BY e.key, e.day
+            """
+        )
+
+    @api.model
+    def _get_claim_contributions(self, claims):
+        """
+        Counter rows the claims currently account for, as
+        ``(key, day, claims, approved, approved_amount)`` tuples.
+        """
+        rows = []
+        for claim in claims:
+            ids = {
+                "member_id": claim.member_id.id,
+                "provider_id": claim.provider_id.id,
+                "service_id": claim.service_id.id,
+            }
+            claim_day = (claim.submitted_date or claim.create_date).date()
+            approved = claim.state == "approved"
+            approved_day = (claim.approved_date or claim.create_date).date()
+
+            for template, _sql_key in COUNTER_KEYS.values():
+                key = template.format(**ids)
+                rows.append((key, claim_day, 1, 0, 0.0))
+                if approved:
+                    rows.append((key, approved_day, 0, 1, claim.approved_amount))
+        return rows
+
+    @api.model
+    def _apply(self, added=(), removed=()):
+        """
+        Insert the net change of ``added`` minus ``removed``
+        contributions as delta rows, in a single statement.
+        """
+        deltas = defaultdict(lambda: [0, 0, 0.0])
+        for sign, rows in ((1, added), (-1, removed)):
+            for key, day, claims, approved, amount in rows:
+                delta = deltas[key, day]
+                delta[0] += sign * claims
+                delta[1] += sign * approved
+                delta[2] += sign * amount
+
+        values = [
+            (key, day, claims, approved, amount)
+            for (key, day), (claims, approved, amount) in deltas.items()
+            if claims or approved or amount
+        ]
+        if not values:
+            return
+
+        self.env.cr.execute(
+            f"""
+            INSERT INTO insurance_claim_counter (
+                key, day, claim_count, approved_count, approved_amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT v.*, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM (VALUES {", ".join(f"%(v{i})s" for i in range(len(values)))})
+                AS v(key, day, claim_count, approved_count, approved_amount)
+            """,
+            {"uid": self.env.uid, **{f"v{i}": row for i, row in enumerate(values)}},
+        )
+
+    @api.model
+    def cron_compact(self):
+        """
+        Fold the delta rows of each key and day into one row. Rows
+        inserted while this runs are not in its snapshot and are left for
+        the next run; keys that net to zero disappear.
+        """
+        self.env.cr.execute(
+            """
+            WITH split AS (
+                SELECT key, day
+                FROM insurance_claim_counter
+                GROUP BY key, day
+                HAVING COUNT(*) > 1
+            ),
+            moved AS (
+                DELETE FROM insurance_claim_counter k
+                USING split s
+                WHERE k.key = s.key AND k.day = s.day
+                RETURNING k.key, k.day, k.claim_count, k.approved_count, k.approved_amount
+            )
+            INSERT INTO insurance_claim_counter (
+                key, day, claim_count, approved_count, approved_amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                key, day,
+                SUM(claim_count), SUM(approved_count), SUM(approved_amount),
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM moved
+            GROUP BY key, day
+            HAVING SUM(claim_count) != 0
+                OR SUM(approved_count) != 0
+                OR ROUND(SUM(approved_amount)::numeric, 2) != 0
+            """,
+            {"uid": self.env.uid},
+        )
+        self.invalidate_model()
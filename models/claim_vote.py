@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class InsuranceClaimVote(models.Model):
@@ -17,6 +17,7 @@ class InsuranceClaimVote(models.Model):
         required=True,
         default=lambda self: self.env.user,
         ondelete="cascade",
+        index=True,
     )
 
     decision = fields.Selection(
@@ -29,10 +30,34 @@ class InsuranceClaimVote(models.Model):
 
     note = fields.Text()
 
-    _sql_constraints = models.Constraint(
-        (
-            "uniq_vote_per_user_per_claim",
-            "unique(claim_id, user_id)",
-            "You have already voted on this claim.",
-        )
+    # Also serves the "awaiting my vote" anti-join on (claim_id, user_id)
+    _uniq_vote_per_user_per_claim = models.Constraint(
+        "unique(claim_id, user_id)",
+        "You have already voted on this claim.",
     )
+
+    # -------------------------------------------------
+    # COMMITTEE SNAPSHOT
+    # -------------------------------------------------
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        votes = super().create(vals_list)
+        Stat = self.env["insurance.committee.stat"]
+        Stat._apply(added=Stat._get_vote_contributions(votes))
+        return votes
+
+    def write(self, vals):
+        if not {"claim_id", "user_id", "decision"}.intersection(vals):
+            return super().write(vals)
+
+        Stat = self.env["insurance.committee.stat"]
+        before = Stat._get_vote_contributions(self)
+        res = super().write(vals)
+        Stat._apply(added=Stat._get_vote_contributions(self), removed=before)
+        return res
+
+    def unlink(self):
+        Stat = self.env["insurance.committee.stat"]
+        Stat._apply(removed=Stat._get_vote_contributions(self))
+        return super().unlink()
@@ -0,0 +1,210 @@
+import numpy as np
+
+from odoo import models, api
+
+EDGE_FETCH_SIZE = 100000
+
+LABEL_PROPAGATION_ROUNDS = 10
+
+# Clusters smaller than this, or served by a single provider, are
+# ordinary patient bases rather than rings.
+MIN_CLUSTER_MEMBERS = 5
+MIN_CLUSTER_PROVIDERS = 2
+
+
+def dominant_labels(nodes, neighbour_labels, weights, n_nodes):
+    """
+    For each node, the neighbour label carrying the most edge weight
+    (ties go to the smallest label). Nodes without edges get -1.
+    """
+    pairs, inverse = np.unique(
+        np.stack((nodes, neighbour_labels), axis=1), axis=0, return_inverse=True
+    )
+    totals = np.bincount(inverse.ravel(), weights=weights)
+
+    # Heaviest label first within each node, then the smallest label
+    order = np.lexsort((pairs[:, 1], -totals, pairs[:, 0]))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = pairs[order[1:], 0] != pairs[order[:-1], 0]
+
+    labels = np.full(n_nodes, -1, dtype=np.int64)
+    labels[pairs[order[first], 0]] = pairs[order[first], 1]
+    return labels
+
+
+class InsuranceCollusionGraph(models.AbstractModel):
+    """
+    Member x provider collusion analysis.
+
+    Builds the bipartite graph of who claims where from integer-indexed
+    edge arrays (one row per member/provider pair, not per claim), finds
+    communities by weighted label propagation, and scores each community
+    by how densely its members share its providers.
+    """
+
+    _name = "insurance.collusion.graph"
+    _description = "Collusion Graph Analysis"
+
+    @api.model
+    def _load_edges(self):
+        """
+        Member/provider edge arrays weighted by claim count, fetched in
+        chunks so only the compact int32 arrays are ever held in full.
+        """
+        self.env["insurance.claim"].flush_model(["member_id", "provider_id", "state"])
+        self.env.cr.execute(
+            """
+            SELECT member_id, provider_id, COUNT(*)
+            FROM insurance_claim
+            WHERE state != 'draft'
+            GROUP BY member_id, provider_id
+            """
+        )
+
+        chunks = []
+        while True:
+            rows = self.env.cr.fetchmany(EDGE_FETCH_SIZE)
+            if not rows:
+                break
+            chunks.append(np.array(rows, dtype=np.int32))
+
+        if not chunks:
+            return None
+        edges = np.concatenate(chunks)
+        return edges[:, 0], edges[:, 1], edges[:, 2]
+
+    @api.model
+    def _find_clusters(self, members, providers, weights):
+        """
+        Weighted label propagation over the bipartite graph. Labels are
+        provider indices; returns the label per member and per provider.
+        """
+        n_members = members.max() + 1
+        n_providers = providers.max() + 1
+        weights = weights.astype(np.float64)
+
+        provider_labels = np.arange(n_providers)
+        member_labels = dominant_labels(
+            members, provider_labels[providers], weights, n_members
+        )
+
+        for _round in range(LABEL_PROPAGATION_ROUNDS):
+            new_provider_labels = dominant_labels(
+                providers, member_labels[members], weights, n_providers
+            )
+            new_member_labels = dominant_labels(
+                members, new_provider_labels[providers], weights, n_members
+            )
+            if np.array_equal(new_provider_labels, provider_labels) and np.array_equal(
+                new_member_labels, member_labels
+            ):
+                break
+            provider_labels, member_labels = new_provider_labels, new_member_labels
+
+        return member_labels, provider_labels
+
+    @api.model
+    def _score_clusters(self, members, providers, member_labels, provider_labels):
+        """
+        Score per cluster label (0-100): edge density between the
+        cluster's members and providers times the share of its members
+        using two or more of its providers.
+        """
+        n_labels = len(provider_labels)
+        member_count = np.bincount(member_labels[member_labels >= 0], minlength=n_labels)
+        provider_count = np.bincount(provider_labels, minlength=n_labels)
+
+        inside = member_labels[members] == provider_labels[providers]
+        internal_edges = np.bincount(
+            provider_labels[providers[inside]], minlength=n_labels
+        )
+
+        internal_degree = np.bincount(members[inside], minlength=len(member_labels))
+        sharing_members = np.bincount(
+            member_labels[internal_degree >= 2], minlength=n_labels
+        )
+
+        possible = member_count * provider_count
+        density = np.divide(
+            internal_edges, possible, out=np.zeros(n_labels), where=possible > 0
+        )
+        sharing = np.divide(
+            sharing_members,
+            member_count,
+            out=np.zeros(n_labels),
+            where=member_count > 0,
+        )
+
+        scores = 100.0 * density * sharing
+        scores[
+            (member_count < MIN_CLUSTER_MEMBERS)
+            | (provider_count < MIN_CLUSTER_PROVIDERS)
+        ] = 0.0
+        return scores
+
+    @api.model
+    def cron_analyze_collusion(self):
+        """
+        Rebuild collusion clusters and write them onto members and
+        providers. Only scoring clusters are written; everything else is
+        reset to cluster 0.
+        """
+        edges = self._load_edges()
+
+        member_rows = provider_rows = []
+        if edges is not None:
+            member_ids, provider_ids, weights = edges
+            member_keys, members = np.unique(member_ids, return_inverse=True)
+            provider_keys, providers = np.unique(provider_ids, return_inverse=True)
+
+            member_labels, provider_labels = self._find_clusters(
+                members, providers, weights
+            )
+            scores = self._score_clusters(
+                members, providers, member_labels, provider_labels
+            )
+
+            # Clusters are identified by the provider their label came from
+            flagged_members = (member_labels >= 0) & (scores[member_labels] > 0)
+            flagged_providers = scores[provider_labels] > 0
+            member_rows = (
+                member_keys[flagged_members].tolist(),
+                provider_keys[member_labels[flagged_members]].tolist(),
+                scores[member_labels[flagged_members]].tolist(),
+            )
+            provider_rows = (
+                provider_keys[flagged_providers].tolist(),
+                provider_keys[provider_labels[flagged_providers]].tolist(),
+                scores[provider_labels[flagged_providers]].tolist(),
+            )
+
+        for table, rows in (
+            ("insurance_member", member_rows),
+            ("insurance_provider", provider_rows),
+        ):
+            self.env.cr.execute(
+                f"""
+                UPDATE {table}
+                SET collusion_cluster = 0, collusion_score = 0.0
+                WHERE collusion_cluster != 0
+                """
+            )
+            if rows:
+                self.env.cr.execute(
+                    f"""
+                    UPDATE {table} t
+                    SET collusion_cluster = v.cluster,
+                        collusion_score = v.score
+                    FROM unnest(%s::int[], %s::int[], %s::float8[])
+                        AS v(id, cluster, score)
+                    WHERE t.id = v.id
+                    """,
+                    rows,
+                )
+
+        self.env["insurance.member"].invalidate_model(
+            ["collusion_cluster", "collusion_score"]
+        )
+        self.env["insurance.provider"].invalidate_model(
+            ["collusion_cluster", "collusion_score"]
+        )
@@ -0,0 +1,286 @@
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+# Snapshot columns, in the order contributions carry their deltas
+STAT_COLUMNS = (
+    "pending_count",
+    "flagged_count",
+    "decided_count",
+    "approved_count",
+    "rejected_count",
+    "timed_count",
+    "decision_hours",
+    "vote_approve_count",
+    "vote_reject_count",
+)
+
+# Claim fields that move a claim between snapshot buckets
+COMMITTEE_STAT_TRACKED_FIELDS = {
+    "state",
+    "committee_required",
+    "fraud_flag",
+    "submitted_date",
+    "decided_date",
+}
+
+
+class InsuranceCommitteeStat(models.Model):
+    """
+    Committee dashboard snapshot.
+
+    Company-wide rows (no user) carry case counts and decision times,
+    member rows carry votes. Claim and vote changes only ever INSERT
+    delta rows, so concurrent submissions and decisions never update a
+    shared row; the dashboard sums the rows and the weekly rebuild
+    compacts them back to one per company and member.
+    """
+
+    _name = "insurance.committee.stat"
+    _description = "Committee Dashboard Snapshot"
+    _order = "company_id, user_id"
+
+    company_id = fields.Many2one(
+        "res.company",
+        required=True,
+        readonly=True,
+        ondelete="cascade",
+    )
+
+    user_id = fields.Many2one(
+        "res.users",
+        string="Committee Member",
+        readonly=True,
+        ondelete="cascade",
+    )
+
+    pending_count = fields.Integer(string="Pending Cases", readonly=True)
+    flagged_count = fields.Integer(string="Fraud-Flagged Open Cases", readonly=True)
+    decided_count = fields.Integer(string="Decided Cases", readonly=True)
+    approved_count = fields.Integer(string="Approved Cases", readonly=True)
+    rejected_count = fields.Integer(string="Rejected Cases", readonly=True)
+
+    # Decision time is only known for cases with both dates
+    timed_count = fields.Integer(string="Timed Decisions", readonly=True)
+    decision_hours = fields.Float(string="Total Decision Time (Hours)", readonly=True)
+
+    vote_approve_count = fields.Integer(string="Approve Votes", readonly=True)
+    vote_reject_count = fields.Integer(string="Reject Votes", readonly=True)
+
+    _company_user_idx = models.Index("(company_id, user_id)")
+
+    def init(self):
+        # Seed from the existing history once; later changes are incremental
+        self.env.cr.execute("SELECT 1 FROM insurance_committee_stat LIMIT 1")
+        if not self.env.cr.fetchone():
+            self.cron_rebuild()
+
+    # -------------------------------------------------
+    # INCREMENTAL MAINTENANCE
+    # -------------------------------------------------
+
+    @api.model
+    def _get_claim_contributions(self, claims):
+        """
+        Company-row deltas the claims currently account for, as
+        ``(company_id, None, deltas)`` tuples in STAT_COLUMNS order.
+        Claims without a company are left out, as in the rebuild.
+        """
+        rows = []
+        for claim in claims.filtered("company_id"):
+            open_case = claim.state == "submitted"
+            decided = claim.committee_required and claim.state in ("approved", "rejected")
+
+            # Claims decided before decided_date existed only carry approved_date
+            decided_date = claim.decided_date or claim.approved_date
+            timed = bool(decided and claim.submitted_date and decided_date)
+            hours = 0.0
+            if timed:
+                hours = (decided_date - claim.submitted_date).total_seconds() / 3600
+
+            rows.append(
+                (
+                    claim.company_id.id,
+                    None,
+                    (
+                        int(open_case and claim.committee_required),
+                        int(open_case and claim.fraud_flag),
+                        int(decided),
+                        int(decided and claim.state == "approved"),
+                        int(decided and claim.state == "rejected"),
+                        int(timed),
+                        hours,
+                        0,
+                        0,
+                    ),
+                )
+            )
+        return rows
+
+    @api.model
+    def _get_vote_contributions(self, votes):
+        """Member-row deltas for votes, as ``(company_id, user_id, deltas)``."""
+        return [
+            (
+                vote.claim_id.company_id.id,
+                vote.user_id.id,
+                (
+                    0, 0, 0, 0, 0, 0, 0.0,
+                    int(vote.decision == "approve"),
+                    int(vote.decision == "reject"),
+                ),
+            )
+            for vote in votes
+            if vote.claim_id.company_id
+        ]
+
+    @api.model
+    def _apply(self, added=(), removed=()):
+        """
+        Insert the net change of ``added`` minus ``removed`` as delta
+        rows, in a single statement.
+        """
+        deltas = defaultdict(lambda: [0] * len(STAT_COLUMNS))
+        for sign, rows in ((1, added), (-1, removed)):
+            for company_id, user_id, values in rows:
+                delta = deltas[company_id, user_id]
+                for index, value in enumerate(values):
+                    delta[index] += sign * value
+
+        values = [
+            (company_id, user_id, *delta)
+            for (company_id, user_id), delta in deltas.items()
+            if any(delta)
+        ]
+        if not values:
+            return
+
+        self.env.cr.execute(
+            f"""
+            INSERT INTO insurance_committee_stat (
+                company_id, user_id, {", ".join(STAT_COLUMNS)},
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT v.company_id, v.user_id::int, {", ".join(f"v.{c}" for c in STAT_COLUMNS)},
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM (VALUES {", ".join(f"%(v{i})s" for i in range(len(values)))})
+                AS v(company_id, user_id, {", ".join(STAT_COLUMNS)})
+            """,
+            {"uid": self.env.uid, **{f"v{i}": row for i, row in enumerate(values)}},
+        )
+
+    @api.model
+    def cron_rebuild(self):
+        """
+        Rebuild the snapshot from scratch: compacts the delta rows and
+        corrects any drift. Deltas of transactions still in flight are
+        not visible here, so they are neither deleted nor double counted.
+        """
+        self.env["insurance.claim"].flush_model()
+        self.env["insurance.claim.vote"].flush_model()
+
+        cr = self.env.cr
+        cr.execute("DELETE FROM insurance_committee_stat")
+        timed = (
+            "c.committee_required AND c.state IN ('approved', 'rejected') "
+            "AND c.submitted_date IS NOT NULL "
+            "AND COALESCE(c.decided_date, c.approved_date) IS NOT NULL"
+        )
+        cr.execute(
+            f"""
+            INSERT INTO insurance_committee_stat (
+                company_id, user_id,
+                pending_count, flagged_count, decided_count,
+                approved_count, rejected_count, timed_count, decision_hours,
+                vote_approve_count, vote_reject_count,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                c.company_id, NULL,
+                COUNT(*) FILTER (WHERE c.state = 'submitted' AND c.committee_required),
+                COUNT(*) FILTER (WHERE c.state = 'submitted' AND c.fraud_flag),
+                COUNT(*) FILTER (WHERE c.committee_required AND c.state IN ('approved', 'rejected')),
+                COUNT(*) FILTER (WHERE c.committee_required AND c.state = 'approved'),
+                COUNT(*) FILTER (WHERE c.committee_required AND c.state = 'rejected'),
+                COUNT(*) FILTER (WHERE {timed}),
+                COALESCE(SUM(EXTRACT(EPOCH FROM COALESCE(c.decided_date, c.approved_date) - c.submitted_date) / 3600)
+                    FILTER (WHERE {timed}), 0.0),
+                0, 0,
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM insurance_claim c
+            WHERE c.company_id IS NOT NULL
+            GROUP BY c.company_id
+
+            UNION ALL
+
+            SELECT
+                c.company_id, v.user_id,
+                0, 0, 0, 0, 0, 0, 0.0,
+                COUNT(*) FILTER (WHERE v.decision = 'approve'),
+                COUNT(*) FILTER (WHERE v.decision = 'reject'),
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM insurance_claim_vote v
+            JOIN insurance_claim c ON c.id = v.claim_id
+            WHERE c.company_id IS NOT NULL
+            GROUP BY c.company_id, v.user_id
+            """,
+            {"uid": self.env.uid},
+        )
+        self.invalidate_model()
+
+    # -------------------------------------------------
+    # DASHBOARD DATA PROVIDER
+    # -------------------------------------------------
+
+    @api.model
+    def get_dashboard_data(self):
+        """
+        Committee KPIs for the current companies: two grouped sums over
+        the snapshot rows plus the caller's own anti-join inbox count.
+        """
+        domain = [("company_id", "in", self.env.companies.ids)]
+
+        [totals] = self._read_group(
+            domain + [("user_id", "=", False)],
+            [],
+            [f"{column}:sum" for column in STAT_COLUMNS[:7]],
+        )
+        pending, flagged, decided, approved, rejected, timed, hours = totals
+
+        members = [
+            {
+                "user_id": user.id,
+                "name": user.name,
+                "approve_votes": approve_votes,
+                "reject_votes": reject_votes,
+                "approve_ratio": (
+                    100.0 * approve_votes / (approve_votes + reject_votes)
+                    if approve_votes + reject_votes
+                    else 0.0
+                ),
+            }
+            for user, approve_votes, reject_votes in self._read_group(
+                domain + [("user_id", "!=", False)],
+                ["user_id"],
+                ["vote_approve_count:sum", "vote_reject_count:sum"],
+            )
+        ]
+
+        awaiting_my_vote = self.env["insurance.claim"].search_count(
+            [
+                ("state", "=", "submitted"),
+                ("committee_required", "=", True),
+                ("committee_has_voted", "=", False),
+            ]
+        )
+
+        return {
+            "pending_count": pending,
+            "flagged_count": flagged,
+            "decided_count": decided,
+            "approved_count": approved,
+            "rejected_count": rejected,
+            "avg_decision_hours": hours / timed if timed else 0.0,
+            "awaiting_my_vote": awaiting_my_vote,
+            "members": members,
+        }
@@ -1,5 +1,4 @@
 from odoo import models, fields, api
-from odoo.exceptions import ValidationError, AccessError
 
 class InsuranceCoverageLine(models.Model):
     _name = 'insurance.coverage.line'
@@ -26,53 +25,59 @@ class InsuranceCoverageLine(models.Model):
 
     copay_percentage = fields.Float(string='Copay %')
 
+    # -------------------------------------------------
+    # UTILIZATION (derived from insurance.coverage.usage)
+    # Portfolio-wide for the current year, or for a single
+    # member when ``member_id`` is passed in context.
+    # -------------------------------------------------
+
     used_amount = fields.Float(
         string='Used Amount',
-        default=0.0,
+        compute='_compute_utilization',
     )
 
     remaining_amount = fields.Float(
-        compute='_compute_remaining',
-        store=True,
-    )
-    last_reset_year = fields.Integer(
-        string='Last Reset Year',
-        default=lambda self: fields.Date.today().year,
+        compute='_compute_utilization',
     )
 
     utilization_percent = fields.Float(
         compute='_compute_utilization',
-        store=True,
     )
-    def reset_annual_usage(self):
-        current_year = fields.Date.today().year
 
-        for rec in self:
-            if rec.last_reset_year != current_year:
-                rec.used_amount = 0.0
-                rec.last_reset_year = current_year
+    @api.depends('annual_limit')
+    @api.depends_context('member_id')
+    def _compute_utilization(self):
+        member = self.env['insurance.member'].browse(
+            self.env.context.get('member_id')
+        )
+        used = self.env['insurance.coverage.usage']._get_used_amounts(
+            self, fields.Date.today().year, member=member
+        )
 
-    @api.depends('annual_limit', 'used_amount')
-    def _compute_remaining(self):
         for rec in self:
+            rec.used_amount = used.get(rec.id, 0.0)
             rec.remaining_amount = max(
                 (rec.annual_limit or 0.0) - rec.used_amount, 0.0
             )
-
-    @api.depends('annual_limit', 'used_amount')
-    def _compute_utilization(self):
-        for rec in self:
             if rec.annual_limit:
                 rec.utilization_percent = (rec.used_amount / rec.annual_limit) * 100
             else:
                 rec.utilization_percent = 0.0
-    @api.constrains('used_amount', 'annual_limit')
-    def _check_usage_not_exceed_limit(self):
-        for rec in self:
-            if rec.annual_limit and rec.used_amount > rec.annual_limit:
-                raise ValidationError(
-                    "Coverage usage cannot exceed annual limit."
-                )
-    def cron_reset_coverage_usage(self):
-        lines = self.search([])
-        lines.reset_annual_usage()
+
+    def _get_member_used_amount(self, member, period_year=None):
+        self.ensure_one()
+
+        period_year = period_year or fields.Date.today().year
+        used = self.env['insurance.coverage.usage']._get_used_amounts(
+            self, period_year, member=member
+        )
+        return used.get(self.id, 0.0)
+
+    def _get_member_remaining_amount(self, member, period_year=None):
+        self.ensure_one()
+
+        return max(
+            (self.annual_limit or 0.0)
+            - self._get_member_used_amount(member, period_year),
+            0.0,
+        )
@@ -0,0 +1,112 @@
+from odoo import models, fields, api
+
+
+class InsuranceCoverageUsage(models.Model):
+    """
+    Append-only coverage usage counter.
+
+    One row per approved claim, keyed by member, service and period.
+    Approvals only ever insert their own row, so concurrent approvals on
+    the same coverage template never update a shared record. Totals are
+    derived by aggregation.
+    """
+
+    _name = "insurance.coverage.usage"
+    _description = "Coverage Usage"
+    _order = "period_year desc, id desc"
+
+    claim_id = fields.Many2one(
+        "insurance.claim",
+        required=True,
+        ondelete="cascade",
+    )
+
+    coverage_line_id = fields.Many2one(
+        "insurance.coverage.line",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+
+    member_id = fields.Many2one(
+        "insurance.member",
+        required=True,
+        ondelete="cascade",
+    )
+
+    service_id = fields.Many2one(
+        "insurance.service",
+        required=True,
+        ondelete="restrict",
+    )
+
+    period_year = fields.Integer(
+        string="Period",
+        required=True,
+    )
+
+    amount = fields.Float(
+        string="Used Amount",
+        required=True,
+    )
+
+    _claim_uniq = models.Constraint(
+        "UNIQUE(claim_id)",
+        "Coverage usage is already recorded for this claim.",
+    )
+
+    _member_service_period_idx = models.Index(
+        "(member_id, service_id, period_year)"
+    )
+
+    def init(self):
+        # Seed counters for claims approved before usage rows existed.
+        # Idempotent, so it is safe on every module update.
+        self.env.cr.execute(
+            """
+            INSERT INTO insurance_coverage_usage (
+                claim_id, coverage_line_id, member_id, service_id,
+                period_year, amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                c.id, cl.id, c.member_id, c.service_id,
+                EXTRACT(YEAR FROM c.approved_date)::integer,
+                COALESCE(c.approved_amount, 0.0),
+                1, now() at time zone 'UTC', 1, now() at time zone 'UTC'
+            FROM insurance_claim c
+            JOIN insurance_policy p ON p.id = c.policy_id
+            JOIN LATERAL (
+                SELECT l.id
+                FROM insurance_coverage_line l
+                WHERE l.template_id = p.coverage_template_id
+                  AND l.service_id = c.service_id
+                  AND l.covered
+                ORDER BY l.id
+                LIMIT 1
+            ) cl ON TRUE
+            WHERE c.state = 'approved'
+              AND c.approved_date IS NOT NULL
+            ON CONFLICT (claim_id) DO NOTHING
+            """
+        )
+
+    @api.model
+    def _get_used_amounts(self, coverage_lines, period_year, member=None):
+        """
+        Sum usage per coverage line for a period, optionally restricted
+        to a single member. Returns ``{coverage_line_id: amount}``.
+        """
+        domain = [
+            ("coverage_line_id", "in", coverage_lines.ids),
+            ("period_year", "=", period_year),
+        ]
+        if member:
+            domain.append(("member_id", "=", member.id))
+
+        return {
+            line.id: amount
+            for line, amount in self._read_group(
+                domain, ["coverage_line_id"], ["amount:sum"]
+            )
+        }
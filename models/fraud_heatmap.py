@@ -1,29 +1,76 @@
-from odoo import models, fields
+from odoo import models, fields, api
 
 
 class InsuranceFraudHeatmap(models.Model):
+    """
+    Pre-aggregated fraud heatmap, bucketed by month and company.
+
+    Backed by a materialized view refreshed by cron, so dashboards and
+    trend views read a small set of rows instead of re-aggregating the
+    claims table on every open.
+    """
+
     _name = "insurance.fraud.heatmap"
     _description = "Insurance Fraud Heatmap"
     _auto = False
+    _order = "period_month desc"
 
+    period_month = fields.Date(string="Month")
+    company_id = fields.Many2one("res.company", string="Company")
     service_id = fields.Many2one("insurance.service", string="Service")
     provider_id = fields.Many2one("insurance.provider", string="Provider")
+    collusion_cluster = fields.Integer(string="Collusion Cluster", aggregator=False)
     claim_count = fields.Integer(string="Claims")
-    avg_fraud_score = fields.Float(string="Avg Fraud Score")
+    claimed_amount = fields.Float(string="Claimed Amount")
+    avg_fraud_score = fields.Float(string="Avg Fraud Score", aggregator="avg")
 
     def init(self):
-        self.env.cr.execute(
-            """
-            CREATE OR REPLACE VIEW insurance_fraud_heatmap AS (
+        cr = self.env.cr
+
+        # The view used to be a plain VIEW; drop whichever kind exists
+        cr.execute("SELECT relkind FROM pg_class WHERE relname = %s", (self._table,))
+        row = cr.fetchone()
+        if row and row[0] == "v":
+            cr.execute(f"DROP VIEW {self._table}")
+        elif row and row[0] == "m":
+            cr.execute(f"DROP MATERIALIZED VIEW {self._table}")
+
+        cr.execute(
+            f"""
+            CREATE MATERIALIZED VIEW {self._table} AS (
                 SELECT
                     MIN(c.id) AS id,
+                    date_trunc('month', c.create_date)::date AS period_month,
+                    c.company_id,
                     c.service_id,
                     c.provider_id,
+                    pr.collusion_cluster,
                     COUNT(*) AS claim_count,
+                    SUM(c.claimed_amount) AS claimed_amount,
                     AVG(c.fraud_score) AS avg_fraud_score
                 FROM insurance_claim c
+                JOIN insurance_provider pr ON pr.id = c.provider_id
                 WHERE c.fraud_flag = TRUE
-                GROUP BY c.service_id, c.provider_id
+                GROUP BY 2, 3, 4, 5, 6
             )
-        """
+            """
         )
+
+        # A unique index is required for REFRESH ... CONCURRENTLY
+        cr.execute(f"CREATE UNIQUE INDEX {self._table}_id_uniq ON {self._table} (id)")
+        cr.execute(
+            f"CREATE INDEX {self._table}_company_month_idx "
+            f"ON {self._table} (company_id, period_month)"
+        )
+        cr.execute(
+            f"CREATE INDEX {self._table}_month_idx ON {self._table} (period_month)"
+        )
+
+    @api.model
+    def cron_refresh(self):
+        """
+        Re-aggregate without blocking dashboard readers.
+        """
+        self.env["insurance.claim"].flush_model()
+        self.env.cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self._table}")
+        self.invalidate_model()
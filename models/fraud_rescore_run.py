@@ -0,0 +1,143 @@
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+RESCORE_CHUNK_SIZE = 500
+
+
+class InsuranceFraudRescoreRun(models.Model):
+    """
+    Re-scores every open (submitted) claim against the current fraud
+    rules, e.g. after a threshold change. Claims an analyst flagged or
+    cleared by hand are left out.
+
+    Claims are processed in id order, one committed chunk at a time, and
+    the last processed id is checkpointed with each chunk, so an
+    interrupted run resumes where it stopped. A dry run only counts the
+    claims whose flag would change.
+    """
+
+    _name = "insurance.fraud.rescore.run"
+    _description = "Fraud Re-scoring Run"
+    _order = "id desc"
+
+    name = fields.Char(
+        required=True,
+        default=lambda self: f"Re-scoring {fields.Date.today()}",
+    )
+
+    dry_run = fields.Boolean(
+        default=True,
+        help="Only report how many claims would change; nothing is written.",
+    )
+
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("running", "Running"),
+            ("done", "Done"),
+        ],
+        default="draft",
+        readonly=True,
+    )
+
+    last_claim_id = fields.Integer(
+        string="Checkpoint",
+        readonly=True,
+        help="Last claim id processed; the run resumes after it.",
+    )
+
+    processed_count = fields.Integer(string="Claims Processed", readonly=True)
+    score_changed_count = fields.Integer(string="Score Changed", readonly=True)
+    newly_flagged_count = fields.Integer(string="Newly Flagged", readonly=True)
+    unflagged_count = fields.Integer(string="No Longer Flagged", readonly=True)
+
+    started_date = fields.Datetime(readonly=True)
+    finished_date = fields.Datetime(readonly=True)
+
+    def action_start(self):
+        for rec in self:
+            if rec.state != "draft":
+                continue
+            rec.write(
+                {
+                    "state": "running",
+                    "started_date": fields.Datetime.now(),
+                }
+            )
+
+        self.env.ref("insurance_core.ir_cron_fraud_rescore")._trigger()
+
+    def _process(self, chunk_size=RESCORE_CHUNK_SIZE, autocommit=False):
+        """
+        Re-score remaining claims chunk by chunk. With ``autocommit``
+        each chunk and its checkpoint are committed together.
+        """
+        self.ensure_one()
+        Claim = self.env["insurance.claim"]
+
+        while True:
+            claims = Claim.search(
+                [
+                    ("state", "=", "submitted"),
+                    ("fraud_manual", "=", False),
+                    ("id", ">", self.last_claim_id),
+                ],
+                order="id",
+                limit=chunk_size,
+            )
+            if not claims:
+                break
+
+            # Dry runs must not leave rule statistics behind either
+            results = claims.with_context(
+                fraud_skip_stats=self.dry_run
+            )._score_fraud_risk()
+
+            changed = gained = lost = 0
+            for claim in claims:
+                score, flag, _reason = results[claim.id]
+                changed += score != claim.fraud_score
+                gained += flag and not claim.fraud_flag
+                lost += claim.fraud_flag and not flag
+
+            if not self.dry_run:
+                needed_committee = claims.filtered("committee_required")
+                claims._apply_fraud_scores(results)
+                (
+                    claims.filtered("committee_required") - needed_committee
+                )._notify_committee()
+
+            self.write(
+                {
+                    "last_claim_id": claims[-1].id,
+                    "processed_count": self.processed_count + len(claims),
+                    "score_changed_count": self.score_changed_count + changed,
+                    "newly_flagged_count": self.newly_flagged_count + gained,
+                    "unflagged_count": self.unflagged_count + lost,
+                }
+            )
+
+            if autocommit:
+                self.env.cr.commit()
+                self.env.invalidate_all()
+
+        self.write(
+            {
+                "state": "done",
+                "finished_date": fields.Datetime.now(),
+            }
+        )
+
+    @api.model
+    def cron_process_rescore_runs(self):
+        for run in self.search([("state", "=", "running")], order="id"):
+            _logger.info(
+                "Fraud re-scoring run %s: resuming after claim %s",
+                run.id,
+                run.last_claim_id,
+            )
+            run._process(autocommit=True)
+            self.env.cr.commit()
@@ -0,0 +1,381 @@
+import logging
+import time
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+from .claim_counter import COUNTER_KEYS
+
+_logger = logging.getLogger(__name__)
+
+# Rule types that aggregate claim counters and so need a grouping
+GROUPED_RULE_TYPES = ("amount_vs_history", "claim_velocity", "repetition")
+
+
+class InsuranceFraudRule(models.Model):
+    """
+    Declarative fraud rule.
+
+    Active rules are compiled into a single aggregate query per batch of
+    claims: rules sharing a grouping key share one lateral aggregate over
+    that key's daily claim counters, so adding a rule adds a FILTER
+    clause rather than another query.
+    """
+
+    _name = "insurance.fraud.rule"
+    _description = "Fraud Detection Rule"
+    _order = "sequence, id"
+
+    name = fields.Char(required=True)
+    code = fields.Char(required=True, help="Short reference, e.g. R1")
+    sequence = fields.Integer(default=10)
+    active = fields.Boolean(default=True)
+
+    company_id = fields.Many2one(
+        "res.company",
+        string="Company",
+        help="Leave empty to apply the rule to every company.",
+    )
+
+    rule_type = fields.Selection(
+        [
+            ("amount_vs_history", "Amount vs History"),
+            ("claim_velocity", "Claim Velocity"),
+            ("repetition", "Repeated Approved Service"),
+            ("early_claim", "Claim Soon After Policy Start"),
+            ("duplicate", "Possible Duplicate"),
+            ("provider_risk", "High-Risk Provider"),
+        ],
+        required=True,
+    )
+
+    group_by = fields.Selection(
+        [
+            ("member", "Member"),
+            ("provider", "Provider"),
+            ("provider_service", "Provider + Service"),
+            ("member_provider_service", "Member + Provider + Service"),
+        ],
+        string="Grouping",
+        default="member",
+        help="Claim counters the rule compares against.",
+    )
+
+    weight = fields.Integer(
+        string="Score Weight",
+        required=True,
+        help="Points added to the fraud score when the rule hits.",
+    )
+
+    threshold = fields.Float(
+        required=True,
+        help="Multiplier of the historical average (Amount vs History), "
+        "minimum number of claims (Velocity, Repetition) "
+        "or minimum provider risk score (High-Risk Provider).",
+    )
+
+    window_days = fields.Integer(
+        string="Window (Days)",
+        help="Only consider history from the last N days (0 = all history). "
+        "For Claim Soon After Policy Start: days since the policy start.",
+    )
+
+    reason = fields.Char(
+        string="Fraud Note",
+        required=True,
+        help="Text recorded on the claim when the rule hits.",
+    )
+
+    stat_ids = fields.One2many(
+        "insurance.fraud.rule.stat",
+        "rule_id",
+        string="Statistics",
+        readonly=True,
+    )
+
+    evaluated_count = fields.Integer(
+        string="Claims Evaluated",
+        compute="_compute_statistics",
+    )
+
+    hit_count = fields.Integer(
+        string="Hits",
+        compute="_compute_statistics",
+    )
+
+    avg_batch_time_ms = fields.Float(
+        string="Avg. Batch Time (ms)",
+        compute="_compute_statistics",
+        help="Average time of the compiled batch query, shared by all rules.",
+    )
+
+    @api.constrains("rule_type", "group_by")
+    def _check_group_by(self):
+        for rec in self:
+            if rec.rule_type in GROUPED_RULE_TYPES and not rec.group_by:
+                raise ValidationError(
+                    f"Fraud rule '{rec.name}' needs a grouping to compare claims against."
+                )
+
+    def _compute_statistics(self):
+        Stat = self.env["insurance.fraud.rule.stat"]
+        stats = {
+            rule.id: (evaluated, hits)
+            for rule, evaluated, hits in Stat._read_group(
+                [("rule_id", "in", self.ids)],
+                ["rule_id"],
+                ["evaluated_count:sum", "hit_count:sum"],
+            )
+        }
+
+        # Batch timing rows carry no rule
+        [(batches, duration)] = Stat._read_group(
+            [("rule_id", "=", False)],
+            [],
+            ["batch_count:sum", "duration_ms:sum"],
+        )
+        avg_batch_time = duration / batches if batches else 0.0
+
+        for rec in self:
+            evaluated, hits = stats.get(rec.id, (0, 0))
+            rec.evaluated_count = evaluated
+            rec.hit_count = hits
+            rec.avg_batch_time_ms = avg_batch_time
+
+    # -------------------------------------------------
+    # COMPILATION
+    # Each _compile_<rule_type> returns (group_key, aggregates, hit):
+    # the lateral it needs (or None), the aggregate expressions it adds
+    # to that lateral, and its boolean hit expression.
+    # -------------------------------------------------
+
+    def _param(self, name):
+        return f"%(r{self.id}_{name})s"
+
+    def _window_filter(self):
+        if not self.window_days:
+            return "TRUE"
+        return f"k.day > %(today)s::date - {self._param('window')}"
+
+    def _compile_amount_vs_history(self):
+        column = f"r{self.id}"
+        window = self._window_filter()
+        aggregate = (
+            f"SUM(k.approved_amount) FILTER (WHERE {window}) "
+            f"/ NULLIF(SUM(k.approved_count) FILTER (WHERE {window}), 0) AS {column}"
+        )
+        hit = f"b.claimed_amount > g_{self.group_by}.{column} * {self._param('threshold')}"
+        return self.group_by, [aggregate], hit
+
+    def _compile_claim_velocity(self):
+        column = f"r{self.id}"
+        aggregate = f"SUM(k.claim_count) FILTER (WHERE {self._window_filter()}) AS {column}"
+        hit = f"g_{self.group_by}.{column} >= {self._param('threshold')}"
+        return self.group_by, [aggregate], hit
+
+    def _compile_repetition(self):
+        column = f"r{self.id}"
+        aggregate = f"SUM(k.approved_count) FILTER (WHERE {self._window_filter()}) AS {column}"
+        hit = f"g_{self.group_by}.{column} >= {self._param('threshold')}"
+        return self.group_by, [aggregate], hit
+
+    def _compile_early_claim(self):
+        hit = f"(%(today)s::date - p.start_date) <= {self._param('window')}"
+        return None, [], hit
+
+    def _compile_duplicate(self):
+        return None, [], "b.duplicate_of_id IS NOT NULL"
+
+    def _compile_provider_risk(self):
+        return None, [], f"pr.risk_score >= {self._param('threshold')}"
+
+    def _compile(self, claim_ids):
+        """
+        Build the single batch query for these rules. Returns the SQL
+        and its params; hit columns follow the order of ``self``.
+        """
+        params = {
+            "claim_ids": list(claim_ids),
+            "today": fields.Date.today(),
+        }
+        laterals = {}
+        hits = []
+
+        for rule in self:
+            group_key, aggregates, hit = getattr(rule, f"_compile_{rule.rule_type}")()
+            if group_key:
+                laterals.setdefault(group_key, []).extend(aggregates)
+
+            if rule.company_id:
+                hit = f"(b.company_id = {rule._param('company')} AND {hit})"
+
+            hits.append(f"COALESCE({hit}, FALSE)")
+            params.update({
+                f"r{rule.id}_threshold": rule.threshold,
+                f"r{rule.id}_window": rule.window_days or 0,
+                f"r{rule.id}_company": rule.company_id.id,
+            })
+
+        joins = "\n".join(
+            f"""
+            LEFT JOIN LATERAL (
+                SELECT {", ".join(aggregates)}
+                FROM insurance_claim_counter k
+                WHERE k.key = {COUNTER_KEYS[group_key][1]}
+            ) g_{group_key} ON TRUE
+            """
+            for group_key, aggregates in laterals.items()
+        )
+
+        query = f"""
+            SELECT b.id, {", ".join(hits)}
+            FROM insurance_claim b
+            LEFT JOIN insurance_policy p ON p.id = b.policy_id
+            LEFT JOIN insurance_provider pr ON pr.id = b.provider_id
+            {joins}
+            WHERE b.id = ANY(%(claim_ids)s)
+        """
+        return query, params
+
+    # -------------------------------------------------
+    # EVALUATION
+    # -------------------------------------------------
+
+    @api.model
+    def _get_active_rules(self, companies):
+        """
+        Active rules applying to ``companies``. Rules that cannot be
+        compiled (e.g. a grouped type whose grouping was cleared in the
+        database) are skipped with a warning rather than failing every
+        claim submission.
+        """
+        rules = self.sudo().search(
+            [
+                "|",
+                ("company_id", "=", False),
+                ("company_id", "in", companies.ids),
+            ]
+        )
+
+        invalid = rules.filtered(
+            lambda r: r.rule_type in GROUPED_RULE_TYPES and r.group_by not in COUNTER_KEYS
+        )
+        for rule in invalid:
+            _logger.warning(
+                "Fraud rule %s (%s) skipped: rule type %s has no grouping",
+                rule.id,
+                rule.code,
+                rule.rule_type,
+            )
+        return rules - invalid
+
+    @api.model
+    def _evaluate_claims(self, claims):
+        """
+        Run every applicable rule over ``claims`` in one query.
+        Returns ``{claim_id: rules_hit}`` and records per-rule hit
+        counts and batch timing, unless the ``fraud_skip_stats`` context
+        key is set (dry runs).
+        """
+        results = {claim.id: self.browse() for claim in claims}
+        rules = self._get_active_rules(claims.company_id)
+        if not claims or not rules:
+            return results
+
+        claims.flush_model()
+        query, params = rules._compile(claims.ids)
+
+        started = time.perf_counter()
+        self.env.cr.execute(query, params)
+        rows = self.env.cr.fetchall()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        hit_counts = dict.fromkeys(rules.ids, 0)
+        for row in rows:
+            claim_id, flags = row[0], row[1:]
+            for rule, hit in zip(rules, flags):
+                if hit:
+                    results[claim_id] |= rule
+                    hit_counts[rule.id] += 1
+
+        if self.env.context.get("fraud_skip_stats"):
+            return results
+
+        self.env["insurance.fraud.rule.stat"]._record_batch(
+            len(rows), duration_ms, hit_counts
+        )
+
+        return results
+
+
+class InsuranceFraudRuleStat(models.Model):
+    """
+    Append-only evaluation statistics. Each batch inserts, in one
+    statement, one row per rule (claims evaluated, hits) and one row
+    without a rule holding the batch query time, so concurrent
+    submissions never contend on the rule record itself. A daily cron
+    folds the rows back to one per rule.
+    """
+
+    _name = "insurance.fraud.rule.stat"
+    _description = "Fraud Rule Statistics"
+    _order = "id desc"
+
+    rule_id = fields.Many2one(
+        "insurance.fraud.rule",
+        ondelete="cascade",
+        index=True,
+        help="Empty on batch timing rows.",
+    )
+
+    evaluated_count = fields.Integer(string="Claims Evaluated")
+    hit_count = fields.Integer(string="Hits")
+    batch_count = fields.Integer(string="Batches")
+    duration_ms = fields.Float(string="Batch Time (ms)")
+
+    @api.model
+    def _record_batch(self, evaluated, duration_ms, hit_counts):
+        values = [(None, evaluated, 0, 1, duration_ms)] + [
+            (rule_id, evaluated, hits, 1, 0.0) for rule_id, hits in hit_counts.items()
+        ]
+        self.env.cr.execute(
+            f"""
+            INSERT INTO insurance_fraud_rule_stat (
+                rule_id, evaluated_count, hit_count, batch_count, duration_ms,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT v.rule_id::int, v.evaluated_count, v.hit_count, v.batch_count, v.duration_ms,
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM (VALUES {", ".join(f"%(v{i})s" for i in range(len(values)))})
+                AS v(rule_id, evaluated_count, hit_count, batch_count, duration_ms)
+            """,
+            {"uid": self.env.uid, **{f"v{i}": row for i, row in enumerate(values)}},
+        )
+
+    @api.model
+    def cron_compact(self):
+        """
+        Fold all statistics rows into one per rule (and one timing row).
+        Rows inserted while this runs are not in its snapshot and are
+        left for the next run.
+        """
+        self.env.cr.execute(
+            """
+            WITH moved AS (
+                DELETE FROM insurance_fraud_rule_stat
+                RETURNING rule_id, evaluated_count, hit_count, batch_count, duration_ms
+            )
+            INSERT INTO insurance_fraud_rule_stat (
+                rule_id, evaluated_count, hit_count, batch_count, duration_ms,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                rule_id,
+                SUM(evaluated_count), SUM(hit_count), SUM(batch_count), SUM(duration_ms),
+                %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+            FROM moved
+            GROUP BY rule_id
+            """,
+            {"uid": self.env.uid},
+        )
+        self.invalidate_model()
@@ -53,6 +53,22 @@ class InsuranceMember(models.Model):
         required=True,
     )
 
+    # -------------------------------------------------
+    # COLLUSION (written by insurance.collusion.graph)
+    # -------------------------------------------------
+
+    collusion_cluster = fields.Integer(
+        string="Collusion Cluster",
+        readonly=True,
+        index=True,
+        help="Provider-seeded cluster id, 0 when not part of a suspicious cluster.",
+    )
+
+    collusion_score = fields.Float(
+        string="Collusion Score",
+        readonly=True,
+    )
+
     # -------------------------------------------------
     # 📊 RISK ENGINE
     # -------------------------------------------------
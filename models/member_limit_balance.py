@@ -0,0 +1,185 @@
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class InsuranceMemberLimitBalance(models.Model):
+    """
+    Per-member, per-policy-year annual limit ledger.
+
+    Submitted claims reserve their claimed amount here, approval turns
+    the reservation into consumption and rejection releases it. Each row
+    is only locked by claims of the same member and policy year, so
+    concurrent submissions for different members never contend.
+    """
+
+    _name = "insurance.member.limit.balance"
+    _description = "Member Annual Limit Balance"
+    _order = "year_start desc"
+
+    member_id = fields.Many2one(
+        "insurance.member",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+
+    policy_id = fields.Many2one(
+        "insurance.policy",
+        required=True,
+        ondelete="cascade",
+    )
+
+    year_start = fields.Date(
+        string="Policy Year Start",
+        required=True,
+    )
+
+    reserved_amount = fields.Float(
+        string="Reserved (Pending Claims)",
+        readonly=True,
+        default=0.0,
+    )
+
+    consumed_amount = fields.Float(
+        string="Consumed (Approved Claims)",
+        readonly=True,
+        default=0.0,
+    )
+
+    available_amount = fields.Float(
+        compute="_compute_available_amount",
+    )
+
+    _member_policy_year_uniq = models.Constraint(
+        "UNIQUE(member_id, policy_id, year_start)",
+        "Only one limit balance per member and policy year is allowed.",
+    )
+
+    @api.depends("reserved_amount", "consumed_amount", "policy_id.annual_limit")
+    def _compute_available_amount(self):
+        for rec in self:
+            rec.available_amount = max(
+                rec.policy_id.annual_limit - rec.consumed_amount - rec.reserved_amount,
+                0.0,
+            )
+
+    # -------------------------------------------------
+    # LOOKUP / LOCKING
+    # -------------------------------------------------
+
+    @api.model
+    def _get_balance(self, member, policy, year_start):
+        """
+        Return the balance row for a member and policy year, creating it
+        on first use. Creation is race-free (ON CONFLICT DO NOTHING) and
+        seeds consumption from approved claims whose service date falls
+        in the policy year.
+        """
+        year_end = fields.Date.add(year_start, years=1)
+
+        self.env["insurance.claim"].flush_model(
+            [
+                "member_id",
+                "policy_id",
+                "state",
+                "approved_amount",
+                "approved_date",
+                "service_date",
+            ]
+        )
+        self.env.cr.execute(
+            """
+            INSERT INTO insurance_member_limit_balance (
+                member_id, policy_id, year_start,
+                reserved_amount, consumed_amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                %(member)s, %(policy)s, %(year_start)s,
+                0.0,
+                COALESCE((
+                    SELECT SUM(c.approved_amount)
+                    FROM insurance_claim c
+                    WHERE c.member_id = %(member)s
+                      AND c.policy_id = %(policy)s
+                      AND c.state = 'approved'
+                      AND COALESCE(c.service_date, c.approved_date::date)
+                          >= %(year_start)s
+                      AND COALESCE(c.service_date, c.approved_date::date)
+                          < %(year_end)s
+                ), 0.0),
+                %(uid)s, now() at time zone 'UTC',
+                %(uid)s, now() at time zone 'UTC'
+            ON CONFLICT (member_id, policy_id, year_start) DO NOTHING
+            """,
+            {
+                "member": member.id,
+                "policy": policy.id,
+                "year_start": year_start,
+                "year_end": year_end,
+                "uid": self.env.uid,
+            },
+        )
+        return self.search(
+            [
+                ("member_id", "=", member.id),
+                ("policy_id", "=", policy.id),
+                ("year_start", "=", year_start),
+            ],
+            limit=1,
+        )
+
+    def _lock_for_update(self):
+        """
+        Row-lock the balances in id order (avoids deadlocks between
+        batches touching the same members) and refresh them from the DB.
+        """
+        if not self:
+            return
+        self.flush_recordset()
+        self.env.cr.execute(
+            """
+            SELECT id FROM insurance_member_limit_balance
+            WHERE id IN %s
+            ORDER BY id
+            FOR NO KEY UPDATE
+            """,
+            (tuple(self.ids),),
+        )
+        self.invalidate_recordset(["reserved_amount", "consumed_amount"])
+
+    def _adjust(self, reserved_delta=0.0, consumed_delta=0.0):
+        """
+        Apply relative changes in a single atomic UPDATE, so release and
+        consumption never need a read-modify-write round trip. Amounts
+        are not clamped: a balance going negative means it drifted from
+        its claims, and is logged.
+        """
+        if not self:
+            return
+        self.flush_recordset(["reserved_amount", "consumed_amount"])
+        self.env.cr.execute(
+            """
+            UPDATE insurance_member_limit_balance
+            SET reserved_amount = reserved_amount + %s,
+                consumed_amount = consumed_amount + %s,
+                write_uid = %s,
+                write_date = now() at time zone 'UTC'
+            WHERE id IN %s
+            RETURNING id, reserved_amount, consumed_amount
+            """,
+            (reserved_delta, consumed_delta, self.env.uid, tuple(self.ids)),
+        )
+        for balance_id, reserved, consumed in self.env.cr.fetchall():
+            if reserved < 0 or consumed < 0:
+                _logger.warning(
+                    "Annual limit balance %s went negative "
+                    "(reserved %.2f, consumed %.2f): it has drifted from its claims",
+                    balance_id,
+                    reserved,
+                    consumed,
+                )
+        self.invalidate_recordset(["reserved_amount", "consumed_amount"])
@@ -0,0 +1,184 @@
+from collections import defaultdict
+
+from odoo import models, fields
+from odoo.exceptions import ValidationError
+
+PAYABLE_ACCOUNT_TYPES = ("liability_payable", "asset_receivable")
+
+
+class InsurancePaymentRun(models.Model):
+    """
+    Pays all approved, unpaid claims of a company in one go.
+
+    Claims are grouped per payee partner, partner type and currency, so
+    a provider with thousands of claims receives a single payment. The
+    payments are created and posted together, every bill is reconciled
+    in one batched reconciliation, and the claims are marked paid with a
+    single write.
+    """
+
+    _name = "insurance.payment.run"
+    _description = "Claim Payment Run"
+    _order = "id desc"
+
+    name = fields.Char(
+        required=True,
+        default=lambda self: f"Payment Run {fields.Date.today()}",
+    )
+
+    company_id = fields.Many2one(
+        "res.company",
+        required=True,
+        default=lambda self: self.env.company,
+    )
+
+    journal_id = fields.Many2one(
+        "account.journal",
+        string="Bank Journal",
+        required=True,
+        domain="[('type', '=', 'bank'), ('company_id', '=', company_id)]",
+        default=lambda self: self.env["account.journal"].search(
+            [
+                ("type", "=", "bank"),
+                ("company_id", "=", self.env.company.id),
+            ],
+            limit=1,
+        ),
+    )
+
+    payment_date = fields.Date(
+        required=True,
+        default=fields.Date.context_today,
+    )
+
+    payee_type = fields.Selection(
+        [
+            ("provider", "Medical Providers"),
+            ("member", "Members"),
+        ],
+        string="Pay To",
+        help="Leave empty to pay providers and members alike.",
+    )
+
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("done", "Done"),
+        ],
+        default="draft",
+        readonly=True,
+    )
+
+    claim_ids = fields.One2many(
+        "insurance.claim",
+        "payment_run_id",
+        string="Claims",
+        readonly=True,
+    )
+
+    payment_ids = fields.Many2many(
+        "account.payment",
+        string="Payments",
+        readonly=True,
+        copy=False,
+    )
+
+    claim_count = fields.Integer(string="Claims Paid", readonly=True)
+    payment_count = fields.Integer(string="Payments", readonly=True)
+    amount_total = fields.Float(string="Total Paid", readonly=True)
+
+    def _get_claims_to_pay(self):
+        """Approved claims whose posted bill still has an open balance."""
+        self.ensure_one()
+
+        domain = [
+            ("company_id", "=", self.company_id.id),
+            ("state", "=", "approved"),
+            ("payment_state", "=", "not_paid"),
+            ("payment_move_id.state", "=", "posted"),
+            ("payment_move_id.amount_residual", ">", 0),
+        ]
+        if self.payee_type:
+            domain.append(("payee_type", "=", self.payee_type))
+
+        return self.env["insurance.claim"].search(domain, order="id")
+
+    def action_pay(self):
+        for run in self:
+            if run.state != "draft":
+                continue
+            run._pay()
+
+    def _pay(self):
+        self.ensure_one()
+
+        claims = self._get_claims_to_pay()
+        if not claims:
+            raise ValidationError("There are no approved, unpaid claims to pay.")
+
+        # --------------------------------
+        # ONE PAYMENT PER PAYEE
+        # --------------------------------
+        group_ids = defaultdict(list)
+        for claim in claims:
+            bill = claim.payment_move_id
+            group_ids[bill.partner_id, claim.payee_type, bill.currency_id].append(claim.id)
+        groups = {key: claims.browse(ids) for key, ids in group_ids.items()}
+
+        payment_vals = []
+        for (partner, payee_type, currency), group in groups.items():
+            payment_vals.append(
+                {
+                    "payment_type": "outbound",
+                    "partner_type": (
+                        "supplier" if payee_type == "provider" else "customer"
+                    ),
+                    "partner_id": partner.id,
+                    "amount": sum(group.payment_move_id.mapped("amount_residual")),
+                    "currency_id": currency.id,
+                    "date": self.payment_date,
+                    "journal_id": self.journal_id.id,
+                    "memo": f"{self.name}: {len(group)} claim(s)",
+                }
+            )
+
+        payments = self.env["account.payment"].create(payment_vals)
+        payments.action_post()
+
+        # --------------------------------
+        # BATCHED RECONCILIATION
+        # One plan entry per payment and account, reconciled together
+        # --------------------------------
+        plan = []
+        for payment, group in zip(payments, groups.values()):
+            lines = (group.payment_move_id.line_ids + payment.move_id.line_ids).filtered(
+                lambda l: l.account_id.account_type in PAYABLE_ACCOUNT_TYPES
+                and not l.reconciled
+            )
+            plan.extend(lines.grouped("account_id").values())
+
+        self.env["account.move.line"]._reconcile_plan(plan)
+
+        # --------------------------------
+        # MARK CLAIMS PAID
+        # --------------------------------
+        claims.write(
+            {
+                "payment_state": "paid",
+                "payment_run_id": self.id,
+            }
+        )
+        # The payment link differs per payee: one write per payment
+        for payment, group in zip(payments, groups.values()):
+            group.payment_id = payment
+
+        self.write(
+            {
+                "state": "done",
+                "payment_ids": [(6, 0, payments.ids)],
+                "claim_count": len(claims),
+                "payment_count": len(payments),
+                "amount_total": sum(payments.mapped("amount")),
+            }
+        )
+
@@ -156,6 +156,26 @@ class InsurancePolicy(models.Model):
         for rec in self:
             rec.member_count = len(rec.member_ids)
 
+    # -------------------------------------------------
+    # POLICY YEAR
+    # -------------------------------------------------
+
+    def _get_policy_year_start(self, on_date=None):
+        """
+        Anniversary of the policy start date on or before ``on_date``.
+        """
+        self.ensure_one()
+
+        on_date = on_date or fields.Date.context_today(self)
+        if not self.start_date or on_date <= self.start_date:
+            return self.start_date or on_date
+
+        years = on_date.year - self.start_date.year
+        year_start = fields.Date.add(self.start_date, years=years)
+        if year_start > on_date:
+            year_start = fields.Date.add(self.start_date, years=years - 1)
+        return year_start
+
     # -------------------------------------------------
     # ACTIONS
     # -------------------------------------------------
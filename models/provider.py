@@ -1,6 +1,46 @@
+import numpy as np
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+# Peer groups (providers offering the same service) smaller than this
+# are too small for a meaningful median, so they score zero.
+MIN_PEER_PROVIDERS = 3
+
+# Scales the MAD so robust z-scores are comparable to standard ones
+MAD_SCALE = 1.4826
+
+
+def _group_medians(groups, values):
+    """Median of ``values`` per group; ``groups`` are dense ids 0..k-1."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return (ordered[starts + (counts - 1) // 2] + ordered[starts + counts // 2]) / 2
+
+
+def robust_zscores(groups, values):
+    """
+    Median/MAD z-score of each value within its group; the median and
+    MAD include the value itself. Groups below MIN_PEER_PROVIDERS or with
+    no spread score zero.
+    """
+    groups = np.unique(groups, return_inverse=True)[1]
+    values = np.asarray(values, dtype=np.float64)
+
+    medians = _group_medians(groups, values)[groups]
+    spread = MAD_SCALE * _group_medians(groups, np.abs(values - medians))[groups]
+
+    zscores = np.divide(
+        values - medians,
+        spread,
+        out=np.zeros_like(values),
+        where=spread > 0,
+    )
+    zscores[np.bincount(groups)[groups] < MIN_PEER_PROVIDERS] = 0.0
+    return zscores
+
 
 class InsuranceProvider(models.Model):
     _name = "insurance.provider"
@@ -9,7 +49,10 @@ class InsuranceProvider(models.Model):
     name = fields.Char(required=True)
     active = fields.Boolean(default=True)
 
-    total_paid = fields.Float(compute="_compute_total_paid", store=True)
+    total_paid = fields.Float(
+        readonly=True,
+        help="Approved claim amounts, refreshed by the nightly risk job.",
+    )
     partner_id = fields.Many2one(
         "res.partner",
         string="Accounting Partner",
@@ -31,13 +74,53 @@ class InsuranceProvider(models.Model):
         index=True,
     )
 
-    @api.depends()
-    def _compute_total_paid(self):
-        for rec in self:
-            claims = self.env["insurance.claim"].search(
-                [("provider_id", "=", rec.id), ("state", "=", "approved")]
-            )
-            rec.total_paid = sum(claims.mapped("approved_amount"))
+    # -------------------------------------------------
+    # RISK SCORING (nightly, see cron_score_provider_risk)
+    # Robust z-scores against providers of the same service,
+    # claim-weighted across the provider's services.
+    # -------------------------------------------------
+
+    risk_score = fields.Float(
+        string="Risk Score",
+        readonly=True,
+        help="Claim-weighted average over the provider's services of the largest "
+        "adverse deviation from service peers, in robust z-scores.",
+    )
+
+    amount_zscore = fields.Float(
+        string="Amount Deviation",
+        readonly=True,
+        help="Average claimed amount compared to peers.",
+    )
+
+    frequency_zscore = fields.Float(
+        string="Frequency Deviation",
+        readonly=True,
+        help="Claims per member compared to peers.",
+    )
+
+    approval_zscore = fields.Float(
+        string="Approval Rate Deviation",
+        readonly=True,
+        help="Approval rate compared to peers (negative = rejected more often).",
+    )
+
+    risk_scored_date = fields.Datetime(
+        string="Risk Scored On",
+        readonly=True,
+    )
+
+    collusion_cluster = fields.Integer(
+        string="Collusion Cluster",
+        readonly=True,
+        index=True,
+        help="Provider-seeded cluster id, 0 when not part of a suspicious cluster.",
+    )
+
+    collusion_score = fields.Float(
+        string="Collusion Score",
+        readonly=True,
+    )
 
     @api.constrains("expense_account_id")
     def _check_expense_account_company(self):
@@ -68,3 +151,132 @@ class InsuranceProvider(models.Model):
                     )
 
                 partner.property_account_payable_id = default_payable
+
+    @api.model
+    def _get_service_statistics(self):
+        """
+        Per provider and service: claim count, average claimed amount,
+        claims per member and approval rate (NULL until a claim of the
+        pair has been decided).
+        """
+        self.env["insurance.claim"].flush_model(
+            ["provider_id", "service_id", "member_id", "state", "claimed_amount"]
+        )
+        self.env.cr.execute(
+            """
+            SELECT
+                c.provider_id,
+                c.service_id,
+                COUNT(*),
+                AVG(c.claimed_amount),
+                COUNT(*)::float / COUNT(DISTINCT c.member_id),
+                COUNT(*) FILTER (WHERE c.state = 'approved')::float
+                    / NULLIF(COUNT(*) FILTER (WHERE c.state IN ('approved', 'rejected')), 0)
+            FROM insurance_claim c
+            WHERE c.state != 'draft'
+            GROUP BY c.provider_id, c.service_id
+            """
+        )
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return None
+
+        provider_ids, service_ids, counts, amounts, frequencies, approvals = (
+            np.array(column, dtype=dtype)
+            for column, dtype in zip(
+                zip(*rows),
+                (np.int32, np.int32, np.float64, np.float64, np.float64, np.float64),
+            )
+        )
+        return provider_ids, service_ids, counts, amounts, frequencies, approvals
+
+    @api.model
+    def cron_score_provider_risk(self):
+        """
+        Nightly provider anomaly scoring, vectorized over every
+        provider x service pair, then written back in two statements.
+        """
+        stats = self._get_service_statistics()
+        scored_ids = []
+
+        if stats:
+            provider_ids, service_ids, counts, amounts, frequencies, approvals = stats
+
+            amount_z = robust_zscores(service_ids, amounts)
+            frequency_z = robust_zscores(service_ids, frequencies)
+
+            approval_z = np.zeros_like(approvals)
+            decided = ~np.isnan(approvals)
+            if decided.any():
+                approval_z[decided] = robust_zscores(
+                    service_ids[decided], approvals[decided]
+                )
+
+            # Only high amounts, high frequency and low approval are adverse
+            pair_risk = np.maximum.reduce(
+                [amount_z, frequency_z, -approval_z, np.zeros_like(amount_z)]
+            )
+
+            scored, providers = np.unique(provider_ids, return_inverse=True)
+            weights = np.bincount(providers, weights=counts)
+
+            def weighted(values):
+                return np.bincount(providers, weights=values * counts) / weights
+
+            scored_ids = scored.tolist()
+            self.env.cr.execute(
+                """
+                UPDATE insurance_provider p
+                SET risk_score = v.risk,
+                    amount_zscore = v.amount,
+                    frequency_zscore = v.frequency,
+                    approval_zscore = v.approval,
+                    risk_scored_date = now() at time zone 'UTC'
+                FROM unnest(
+                    %s::int[], %s::float8[], %s::float8[], %s::float8[], %s::float8[]
+                ) AS v(id, risk, amount, frequency, approval)
+                WHERE p.id = v.id
+                """,
+                (
+                    scored_ids,
+                    weighted(pair_risk).tolist(),
+                    weighted(amount_z).tolist(),
+                    weighted(frequency_z).tolist(),
+                    weighted(approval_z).tolist(),
+                ),
+            )
+
+        self.env.cr.execute(
+            """
+            UPDATE insurance_provider
+            SET risk_score = 0.0,
+                amount_zscore = 0.0,
+                frequency_zscore = 0.0,
+                approval_zscore = 0.0,
+                risk_scored_date = now() at time zone 'UTC'
+            WHERE NOT (id = ANY(%s))
+            """,
+            (scored_ids,),
+        )
+
+        self.env.cr.execute(
+            """
+            UPDATE insurance_provider p
+            SET total_paid = COALESCE((
+                SELECT SUM(c.approved_amount)
+                FROM insurance_claim c
+                WHERE c.provider_id = p.id
+                  AND c.state = 'approved'
+            ), 0.0)
+            """
+        )
+        self.invalidate_model(
+            [
+                "risk_score",
+                "amount_zscore",
+                "frequency_zscore",
+                "approval_zscore",
+                "risk_scored_date",
+                "total_paid",
+            ]
+        )
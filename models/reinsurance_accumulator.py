@@ -0,0 +1,89 @@
+from odoo import models, fields, api
+
+
+class InsuranceReinsuranceAccumulator(models.Model):
+    """
+    Running cumulative losses of an aggregate stop-loss contract for one
+    year. Approvals and reversals adjust it by the claim's own amounts,
+    so the split stays O(1) per claim and history is never re-summed.
+    """
+
+    _name = 'insurance.reinsurance.accumulator'
+    _description = 'Reinsurance Aggregate Accumulator'
+    _order = 'period_year desc'
+
+    reinsurance_contract_id = fields.Many2one(
+        'insurance.reinsurance.contract',
+        required=True,
+        ondelete='cascade',
+    )
+
+    period_year = fields.Integer(
+        string='Year',
+        required=True,
+    )
+
+    cumulative_loss = fields.Float(
+        string='Cumulative Losses',
+        readonly=True,
+        default=0.0,
+    )
+
+    ceded_amount = fields.Float(
+        string='Ceded to Reinsurer',
+        readonly=True,
+        default=0.0,
+    )
+
+    _contract_year_uniq = models.Constraint(
+        'UNIQUE(reinsurance_contract_id, period_year)',
+        'Only one accumulator per contract and year is allowed.',
+    )
+
+    @api.model
+    def _get_locked(self, contract, period_year):
+        """
+        Return the accumulator for a contract and year, created on first
+        use, with a row lock held until the end of the transaction.
+        """
+        self.env.cr.execute(
+            """
+            INSERT INTO insurance_reinsurance_accumulator (
+                reinsurance_contract_id, period_year,
+                cumulative_loss, ceded_amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            VALUES (%s, %s, 0.0, 0.0, %s, now() at time zone 'UTC',
+                    %s, now() at time zone 'UTC')
+            ON CONFLICT (reinsurance_contract_id, period_year) DO NOTHING
+            """,
+            (contract.id, period_year, self.env.uid, self.env.uid),
+        )
+        self.env.cr.execute(
+            """
+            SELECT id FROM insurance_reinsurance_accumulator
+            WHERE reinsurance_contract_id = %s AND period_year = %s
+            FOR NO KEY UPDATE
+            """,
+            (contract.id, period_year),
+        )
+        accumulator = self.browse(self.env.cr.fetchone()[0])
+        accumulator.invalidate_recordset(['cumulative_loss', 'ceded_amount'])
+        return accumulator
+
+    def _adjust(self, loss_delta=0.0, ceded_delta=0.0):
+        self.ensure_one()
+
+        self.flush_recordset(['cumulative_loss', 'ceded_amount'])
+        self.env.cr.execute(
+            """
+            UPDATE insurance_reinsurance_accumulator
+            SET cumulative_loss = GREATEST(cumulative_loss + %s, 0.0),
+                ceded_amount = GREATEST(ceded_amount + %s, 0.0),
+                write_uid = %s,
+                write_date = now() at time zone 'UTC'
+            WHERE id = %s
+            """,
+            (loss_delta, ceded_delta, self.env.uid, self.id),
+        )
+        self.invalidate_recordset(['cumulative_loss', 'ceded_amount'])
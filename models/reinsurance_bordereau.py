@@ -1,6 +1,35 @@
+import csv
+import logging
+
+import xlsxwriter
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+_logger = logging.getLogger(__name__)
+
+GENERATION_CHUNK_SIZE = 1000
+
+# A worker holds a session-level advisory lock (this key, bordereau id)
+# for its whole run. It survives the per-chunk commits and PostgreSQL
+# drops it if the worker's connection dies, so "running and not locked"
+# means abandoned.
+GENERATION_LOCK_KEY = "'insurance_reinsurance_bordereau'::regclass::oid::int"
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_HEADER = [
+    'Claim Number',
+    'Loss Date',
+    'Member Number',
+    'Member',
+    'Provider',
+    'Service Code',
+    'Service',
+    'Claimed Amount',
+    'Approved Amount',
+    'Reinsurer Share',
+]
+
 
 class ReinsuranceBordereau(models.Model):
     _name = 'insurance.reinsurance.bordereau'
@@ -36,6 +65,16 @@ class ReinsuranceBordereau(models.Model):
         tracking=True
     )
 
+    total_claimed_amount = fields.Float(
+        string='Total Claimed',
+        compute='_compute_totals',
+        store=True
+    )
+    total_approved_amount = fields.Float(
+        string='Total Approved',
+        compute='_compute_totals',
+        store=True
+    )
     total_reinsurer_share = fields.Float(
         compute='_compute_totals',
         store=True
@@ -51,12 +90,36 @@ class ReinsuranceBordereau(models.Model):
         store=True
     )
 
-    @api.depends('line_ids.reinsurer_share')
+    @api.depends(
+        'line_ids',
+        'line_ids.claimed_amount',
+        'line_ids.approved_amount',
+        'line_ids.reinsurer_share',
+    )
     def _compute_totals(self):
-        for rec in self:
-            rec.total_reinsurer_share = sum(
-                rec.line_ids.mapped('reinsurer_share')
+        # One grouped aggregate for the whole batch; lines are never loaded
+        totals = {
+            bordereau.id: (count, claimed, approved, ceded)
+            for bordereau, count, claimed, approved, ceded in self.env[
+                'insurance.reinsurance.bordereau.line'
+            ]._read_group(
+                [('bordereau_id', 'in', self.ids)],
+                ['bordereau_id'],
+                [
+                    '__count',
+                    'claimed_amount:sum',
+                    'approved_amount:sum',
+                    'reinsurer_share:sum',
+                ],
             )
+        }
+
+        for rec in self:
+            count, claimed, approved, ceded = totals.get(rec.id, (0, 0.0, 0.0, 0.0))
+            rec.total_claims = count
+            rec.total_claimed_amount = claimed
+            rec.total_approved_amount = approved
+            rec.total_reinsurer_share = ceded
 
     @api.model
     def create(self, vals_list):
@@ -71,28 +134,333 @@ class ReinsuranceBordereau(models.Model):
 
         return super().create(vals_list)
 
+    # ---------------------------
+    # GENERATION PROGRESS
+    # ---------------------------
+    generation_total = fields.Integer(
+        string='Claims to Generate',
+        readonly=True,
+        copy=False,
+    )
+    generation_done = fields.Integer(
+        string='Claims Generated',
+        readonly=True,
+        copy=False,
+    )
+    generation_progress = fields.Float(
+        string='Generation Progress',
+        compute='_compute_generation_progress',
+    )
+    generation_state = fields.Selection(
+        [
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        string='Generation Status',
+        readonly=True,
+        copy=False,
+        index=True,
+    )
+    run_id = fields.Many2one(
+        'insurance.reinsurance.bordereau.run',
+        string='Generation Run',
+        readonly=True,
+        copy=False,
+        ondelete='set null',
+    )
+
+    @api.depends('generation_total', 'generation_done')
+    def _compute_generation_progress(self):
+        for rec in self:
+            if rec.generation_total:
+                rec.generation_progress = (
+                    rec.generation_done / rec.generation_total
+                ) * 100
+            else:
+                rec.generation_progress = 0.0
+
     # ---------------------------
     # AUTO-GENERATE LINES
     # ---------------------------
-    def action_generate_lines(self):
+    def _get_pending_claim_ids(self):
+        """
+        Ids of eligible claims not yet locked to any bordereau. Because
+        locked claims drop out of this set, re-running generation resumes
+        where an interrupted run stopped.
+        """
+        self.ensure_one()
+
+        return self.env['insurance.claim'].search([
+            ('state', '=', 'approved'),
+            ('payment_state', '=', 'paid'),
+            ('reinsurance_contract_id', '=', self.reinsurance_contract_id.id),
+            ('approved_date', '>=', self.period_start),
+            ('approved_date', '<=', self.period_end),
+            ('reinsurer_share', '>', 0),
+            ('bordereau_line_id', '=', False),
+        ], order='id').ids
+
+    def _lock_generated_claims(self, claim_ids):
+        """
+        Point the claims at their new lines with one bulk UPDATE.
+        """
+        self.ensure_one()
+
+        self.env['insurance.reinsurance.bordereau.line'].flush_model()
+        self.env.cr.execute(
+            """
+            UPDATE insurance_claim c
+            SET bordereau_line_id = l.id
+            FROM insurance_reinsurance_bordereau_line l
+            WHERE l.claim_id = c.id
+              AND l.bordereau_id = %s
+              AND c.id IN %s
+              AND c.bordereau_line_id IS NULL
+            """,
+            (self.id, tuple(claim_ids)),
+        )
+        self.env['insurance.claim'].invalidate_model(['bordereau_line_id'])
+
+    def _generate_lines(self, chunk_size=GENERATION_CHUNK_SIZE, autocommit=False):
+        """
+        Generate lines in chunks: one multi-record create and one bulk
+        claim lock per chunk. With ``autocommit`` (cron / batch runs) each
+        chunk is committed, so an interrupted run keeps its progress.
+        """
+        Line = self.env['insurance.reinsurance.bordereau.line']
+
         for bordereau in self:
             if bordereau.state != 'draft':
                 raise ValidationError("Only draft bordereaux can be generated.")
 
-            claims = self.env['insurance.claim'].search([
-                ('state', '=', 'approved'),
-                ('reinsurance_contract_id', '=', bordereau.reinsurance_contract_id.id),
-                ('approved_date', '>=', bordereau.period_start),
-                ('approved_date', '<=', bordereau.period_end),
-                ('reinsurer_share', '>', 0),
-                ('bordereau_line_id', '=', False),
-            ])
-
-            for claim in claims:
-                line = self.env['insurance.reinsurance.bordereau.line'].create({
-                    'bordereau_id': bordereau.id,
-                    'claim_id': claim.id,
-                })
-
-                # 🔒 LOCK THE CLAIM TO THIS BORDEREAU
-                claim.bordereau_line_id = line.id
+            claim_ids = bordereau._get_pending_claim_ids()
+            bordereau.write({
+                'generation_total': bordereau.generation_done + len(claim_ids),
+            })
+
+            for start in range(0, len(claim_ids), chunk_size):
+                chunk = claim_ids[start:start + chunk_size]
+
+                Line.create([
+                    {'bordereau_id': bordereau.id, 'claim_id': claim_id}
+                    for claim_id in chunk
+                ])
+
+                # 🔒 LOCK THE CLAIMS TO THIS BORDEREAU
+                bordereau._lock_generated_claims(chunk)
+
+                bordereau.generation_done += len(chunk)
+                _logger.info(
+                    "Bordereau %s: %s/%s claims generated",
+                    bordereau.name,
+                    bordereau.generation_done,
+                    bordereau.generation_total,
+                )
+
+                if autocommit:
+                    self.env.cr.commit()
+
+                # keep the environment cache flat across chunks
+                self.env.invalidate_all()
+
+    def action_generate_lines(self):
+        self._generate_lines()
+
+    # ---------------------------
+    # GENERATION QUEUE (CRON WORKERS)
+    # ---------------------------
+    @api.model
+    def _claim_next_queued(self):
+        """
+        Take one queued bordereau, skipping rows other workers hold, lock
+        it for the run and mark it running in its own committed
+        transaction.
+        """
+        last_id = 0
+        while True:
+            self.env.cr.execute(
+                """
+                SELECT id FROM insurance_reinsurance_bordereau
+                WHERE generation_state = 'queued'
+                  AND id > %s
+                ORDER BY id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+                """,
+                (last_id,),
+            )
+            row = self.env.cr.fetchone()
+            if not row:
+                return self.browse()
+
+            # Locked separately: inside the query above PostgreSQL could
+            # try (and keep) locks on rows it then skips. A row whose lock
+            # is still held (its previous worker is winding down) is
+            # passed over for the next one.
+            self.env.cr.execute(
+                f"SELECT pg_try_advisory_lock({GENERATION_LOCK_KEY}, %s)", (row[0],)
+            )
+            if self.env.cr.fetchone()[0]:
+                break
+            last_id = row[0]
+
+        bordereau = self.browse(row[0])
+        bordereau.generation_state = 'running'
+        self.env.cr.commit()
+        return bordereau
+
+    def _release_generation_lock(self):
+        self.env.cr.execute(
+            f"SELECT pg_advisory_unlock({GENERATION_LOCK_KEY}, %s)",
+            (self.id,),
+        )
+
+    @api.model
+    def _requeue_stale_generations(self):
+        """
+        Put back runs whose worker died: running rows that can be row
+        locked and whose advisory lock no live worker holds. The
+        transaction-level probe lock is released on commit.
+        """
+        self.env.cr.execute(
+            f"""
+            UPDATE insurance_reinsurance_bordereau
+            SET generation_state = 'queued'
+            WHERE id IN (
+                SELECT id FROM insurance_reinsurance_bordereau
+                WHERE generation_state = 'running'
+                FOR UPDATE SKIP LOCKED
+            )
+            AND pg_try_advisory_xact_lock({GENERATION_LOCK_KEY}, id)
+            """
+        )
+        self.invalidate_model(['generation_state'])
+
+    @api.model
+    def cron_process_generation_queue(self):
+        """
+        Worker loop. Several cron jobs run this concurrently; each takes
+        one contract's bordereau at a time and commits it independently.
+        Finished runs are closed at the start and end of every pass.
+        """
+        Run = self.env['insurance.reinsurance.bordereau.run']
+
+        self._requeue_stale_generations()
+        Run._close_finished_runs()
+        self.env.cr.commit()
+
+        while True:
+            bordereau = self._claim_next_queued()
+            if not bordereau:
+                Run._close_finished_runs()
+                self.env.cr.commit()
+                return
+
+            try:
+                bordereau._run_generation()
+            finally:
+                # Pooled connections outlive the job: always hand the lock back
+                bordereau._release_generation_lock()
+
+    def _run_generation(self):
+        self.ensure_one()
+        try:
+            self._generate_lines(autocommit=True)
+            self.generation_state = 'done'
+        except Exception:
+            self.env.cr.rollback()
+            _logger.exception("Bordereau %s: generation failed", self.id)
+            self.generation_state = 'failed'
+
+        self.env.cr.commit()
+
+    # ---------------------------
+    # STREAMING EXPORT
+    # ---------------------------
+    def _iter_export_rows(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Yield snapshot rows chunk by chunk using keyset pagination on the
+        line id, so only one chunk is ever held in memory and no ORM
+        records are built.
+        """
+        self.ensure_one()
+
+        self.env['insurance.reinsurance.bordereau.line'].flush_model()
+        last_id = 0
+        while True:
+            self.env.cr.execute(
+                """
+                SELECT l.id, c.name, l.loss_date,
+                       m.member_number, m.name, p.name, s.code, s.name,
+                       l.claimed_amount, l.approved_amount, l.reinsurer_share
+                FROM insurance_reinsurance_bordereau_line l
+                JOIN insurance_claim c ON c.id = l.claim_id
+                LEFT JOIN insurance_member m ON m.id = l.member_id
+                LEFT JOIN insurance_provider p ON p.id = l.provider_id
+                LEFT JOIN insurance_service s ON s.id = l.service_id
+                WHERE l.bordereau_id = %s AND l.id > %s
+                ORDER BY l.id
+                LIMIT %s
+                """,
+                (self.id, last_id, chunk_size),
+            )
+            rows = self.env.cr.fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            for row in rows:
+                yield row[1:]
+
+    def _export_lines_to_file(self, path, file_format='csv'):
+        """
+        Write the bordereau lines to ``path`` incrementally. XLSX uses
+        xlsxwriter's constant-memory mode, which flushes each row to disk.
+        """
+        self.ensure_one()
+
+        if file_format == 'csv':
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_HEADER)
+                for row in self._iter_export_rows():
+                    writer.writerow(row)
+            return
+
+        if file_format == 'xlsx':
+            workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            sheet = workbook.add_worksheet(self.name.replace('/', '-')[:31])
+            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+            sheet.write_row(0, 0, EXPORT_HEADER)
+            for index, row in enumerate(self._iter_export_rows(), start=1):
+                sheet.write_row(index, 0, row)
+                if row[1]:
+                    sheet.write_datetime(index, 1, row[1], date_format)
+            workbook.close()
+            return
+
+        raise ValidationError("Unsupported export format: %s" % file_format)
+
+    def _action_export(self, file_format):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/insurance/reinsurance/bordereau/%s/export/%s' % (self.id, file_format),
+            'target': 'self',
+        }
+
+    def action_export_csv(self):
+        return self._action_export('csv')
+
+    def action_export_xlsx(self):
+        return self._action_export('xlsx')
+
+    def action_confirm(self):
+        for rec in self:
+            if rec.state != 'draft':
+                raise ValidationError("Only draft bordereaux can be confirmed.")
+            if not rec.total_claims:
+                raise ValidationError("Cannot confirm a bordereau without lines.")
+        self.write({'state': 'confirmed'})
@@ -1,6 +1,16 @@
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+SNAPSHOT_CLAIM_FIELDS = [
+    'approved_date',
+    'member_id',
+    'provider_id',
+    'service_id',
+    'claimed_amount',
+    'approved_amount',
+    'reinsurer_share',
+]
+
 
 class ReinsuranceBordereauLine(models.Model):
     _name = 'insurance.reinsurance.bordereau.line'
@@ -71,27 +81,44 @@ class ReinsuranceBordereauLine(models.Model):
     # -------------------------------------------------
     # CREATE OVERRIDE → SNAPSHOT FREEZE
     # -------------------------------------------------
-    @api.model
-    def create(self, vals):
-        claim = self.env['insurance.claim'].browse(vals.get('claim_id'))
-
-        if not claim:
+    @api.model_create_multi
+    def create(self, vals_list):
+        claim_ids = {vals.get('claim_id') for vals in vals_list}
+        if not all(claim_ids):
             raise ValidationError("Invalid claim.")
 
-        if claim.state != 'approved':
-            raise ValidationError("Only approved claims can be added to a bordereau.")
+        # One read for every referenced claim, instead of a browse per line
+        claims = self.env['insurance.claim'].browse(claim_ids).exists()
+        claims.fetch(SNAPSHOT_CLAIM_FIELDS + ['name', 'state', 'payment_state'])
 
-        if claim.payment_state != 'paid':
-            raise ValidationError("Only paid claims can be added to a bordereau.")
-
-        vals.update({
-            'loss_date': claim.approved_date,
-            'member_id': claim.member_id.id,
-            'provider_id': claim.provider_id.id,
-            'service_id': claim.service_id.id,
-            'claimed_amount': claim.claimed_amount,
-            'approved_amount': claim.approved_amount,
-            'reinsurer_share': claim.reinsurer_share,
-        })
+        if len(claims) != len(claim_ids):
+            raise ValidationError("Invalid claim.")
 
-        return super().create(vals)
+        not_approved = claims.filtered(lambda c: c.state != 'approved')
+        if not_approved:
+            raise ValidationError(
+                "Only approved claims can be added to a bordereau.\n\n%s"
+                % ", ".join(not_approved[:20].mapped('name'))
+            )
+
+        not_paid = claims.filtered(lambda c: c.payment_state != 'paid')
+        if not_paid:
+            raise ValidationError(
+                "Only paid claims can be added to a bordereau.\n\n%s"
+                % ", ".join(not_paid[:20].mapped('name'))
+            )
+
+        claims_by_id = {claim.id: claim for claim in claims}
+        for vals in vals_list:
+            claim = claims_by_id[vals['claim_id']]
+            vals.update({
+                'loss_date': claim.approved_date,
+                'member_id': claim.member_id.id,
+                'provider_id': claim.provider_id.id,
+                'service_id': claim.service_id.id,
+                'claimed_amount': claim.claimed_amount,
+                'approved_amount': claim.approved_amount,
+                'reinsurer_share': claim.reinsurer_share,
+            })
+
+        return super().create(vals_list)
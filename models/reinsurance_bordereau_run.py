@@ -0,0 +1,157 @@
+from psycopg2.errors import SerializationFailure
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+GENERATION_WORKER_CRONS = [
+    'insurance_core.ir_cron_bordereau_generation_worker_1',
+    'insurance_core.ir_cron_bordereau_generation_worker_2',
+    'insurance_core.ir_cron_bordereau_generation_worker_3',
+]
+
+
+class ReinsuranceBordereauRun(models.Model):
+    """
+    Period-wide bordereau generation. Starting a run queues one draft
+    bordereau per active contract; the generation worker crons pick them
+    up in parallel.
+    """
+
+    _name = 'insurance.reinsurance.bordereau.run'
+    _description = 'Bordereau Generation Run'
+    _order = 'period_start desc, id desc'
+
+    name = fields.Char(
+        compute='_compute_name',
+        store=True,
+    )
+
+    period_start = fields.Date(required=True)
+    period_end = fields.Date(required=True)
+
+    bordereau_ids = fields.One2many(
+        'insurance.reinsurance.bordereau',
+        'run_id',
+        string='Bordereaux',
+        readonly=True,
+    )
+
+    state = fields.Selection(
+        [
+            ('draft', 'Draft'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+        ],
+        default='draft',
+        readonly=True,
+    )
+
+    bordereau_count = fields.Integer(compute='_compute_progress')
+    done_count = fields.Integer(string='Completed', compute='_compute_progress')
+    failed_count = fields.Integer(string='Failed', compute='_compute_progress')
+    progress = fields.Float(compute='_compute_progress')
+
+    @api.depends('period_start', 'period_end')
+    def _compute_name(self):
+        for rec in self:
+            rec.name = f"{rec.period_start} → {rec.period_end}"
+
+    def _compute_progress(self):
+        stats = {
+            (run.id, state): (count, done, total)
+            for run, state, count, done, total in self.env[
+                'insurance.reinsurance.bordereau'
+            ]._read_group(
+                [('run_id', 'in', self.ids)],
+                ['run_id', 'generation_state'],
+                ['__count', 'generation_done:sum', 'generation_total:sum'],
+            )
+        }
+
+        for rec in self:
+            count = done_count = failed_count = 0
+            progress_units = 0.0
+            for (run_id, state), (n, done, total) in stats.items():
+                if run_id != rec.id:
+                    continue
+                count += n
+                if state == 'done':
+                    done_count += n
+                    progress_units += n
+                elif state == 'failed':
+                    failed_count += n
+                    progress_units += n
+                elif state == 'running' and total:
+                    progress_units += done / total
+
+            rec.bordereau_count = count
+            rec.done_count = done_count
+            rec.failed_count = failed_count
+            rec.progress = (progress_units / count) * 100 if count else 0.0
+
+    def action_start(self):
+        Bordereau = self.env['insurance.reinsurance.bordereau']
+
+        for rec in self:
+            if rec.state != 'draft':
+                raise ValidationError("This run has already been started.")
+
+            contracts = self.env['insurance.reinsurance.contract'].search([
+                ('start_date', '<=', rec.period_end),
+                ('end_date', '>=', rec.period_start),
+            ])
+            Bordereau.create([
+                {
+                    'reinsurance_contract_id': contract.id,
+                    'period_start': rec.period_start,
+                    'period_end': rec.period_end,
+                    'generation_state': 'queued',
+                    'run_id': rec.id,
+                }
+                for contract in contracts
+            ])
+            rec.state = 'running'
+
+        for xmlid in GENERATION_WORKER_CRONS:
+            cron = self.env.ref(xmlid, raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    @api.model
+    def _close_finished_runs(self):
+        """
+        Close every running run whose bordereaux are all done or failed.
+
+        Workers call this in a fresh transaction after committing their
+        own bordereau, never inside it: two workers finishing the last
+        two bordereaux at once cannot see each other's uncommitted state,
+        but whichever sweeps last sees both. If another worker closes the
+        same runs concurrently, this sweep steps aside.
+        """
+        self.env['insurance.reinsurance.bordereau'].flush_model(
+            ['run_id', 'generation_state']
+        )
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute(
+                    """
+                    UPDATE insurance_reinsurance_bordereau_run r
+                    SET state = 'done',
+                        write_uid = %s,
+                        write_date = now() at time zone 'UTC'
+                    WHERE r.id IN (
+                        SELECT id FROM insurance_reinsurance_bordereau_run
+                        WHERE state = 'running'
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM insurance_reinsurance_bordereau b
+                        WHERE b.run_id = r.id
+                          AND b.generation_state NOT IN ('done', 'failed')
+                    )
+                    """,
+                    (self.env.uid,),
+                )
+        except SerializationFailure:
+            pass
+        self.invalidate_model(['state'])
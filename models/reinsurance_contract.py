@@ -1,6 +1,10 @@
+import numpy as np
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
+SIMULATION_FETCH_SIZE = 100000
+
 
 class InsuranceReinsuranceContract(models.Model):
     _name = 'insurance.reinsurance.contract'
@@ -37,6 +41,16 @@ class InsuranceReinsuranceContract(models.Model):
     # STOP-LOSS RULES
     # ----------------------------
 
+    treaty_type = fields.Selection(
+        [
+            ('per_claim', 'Per-Claim Excess of Loss'),
+            ('aggregate', 'Annual Aggregate Stop-Loss'),
+        ],
+        string='Treaty Type',
+        required=True,
+        default='per_claim',
+    )
+
     retention_amount = fields.Float(
         string='Retention (Company Keeps)',
         required=True,
@@ -48,6 +62,23 @@ class InsuranceReinsuranceContract(models.Model):
         help='Maximum reinsurer liability per claim'
     )
 
+    aggregate_retention_amount = fields.Float(
+        string='Annual Aggregate Retention',
+        help='Cumulative yearly losses the insurer keeps before the reinsurer pays'
+    )
+
+    aggregate_limit_amount = fields.Float(
+        string='Annual Aggregate Limit',
+        help='Maximum reinsurer liability per year (0 = unlimited)'
+    )
+
+    accumulator_ids = fields.One2many(
+        'insurance.reinsurance.accumulator',
+        'reinsurance_contract_id',
+        string='Aggregate Accumulators',
+        readonly=True,
+    )
+
     start_date = fields.Date(
         required=True
     )
@@ -65,3 +96,243 @@ class InsuranceReinsuranceContract(models.Model):
         for rec in self:
             if rec.end_date < rec.start_date:
                 raise ValidationError("End date must be after start date.")
+
+    # ----------------------------
+    # SPLIT LOGIC
+    # ----------------------------
+
+    def _split_claim_amount(self, amount):
+        """
+        Split an insurer-side claim amount into (insurer, reinsurer)
+        shares. ``_simulate_split`` is the vectorized twin of this rule;
+        keep both in step.
+        """
+        self.ensure_one()
+
+        insurer_share = amount
+        reinsurer_share = 0.0
+
+        if insurer_share > self.retention_amount:
+            reinsurer_share = insurer_share - self.retention_amount
+            insurer_share = self.retention_amount
+
+        if self.max_coverage_amount:
+            reinsurer_share = min(reinsurer_share, self.max_coverage_amount)
+
+        return insurer_share, reinsurer_share
+
+    @api.model
+    def _aggregate_layer_share(self, prior_loss, amount, retention, limit):
+        """
+        Part of ``amount`` that falls inside the aggregate layer
+        [retention, retention + limit] given the losses already
+        accumulated. A limit of 0 means unlimited.
+        """
+        top = retention + limit if limit else float('inf')
+        return max(0.0, min(prior_loss + amount, top) - max(prior_loss, retention))
+
+    def _cede_claim_amount(self, amount, period_year):
+        """
+        Split a claim being approved into (insurer, reinsurer) shares.
+        Aggregate treaties consume the contract-year accumulator under a
+        row lock; per-claim treaties are stateless.
+        """
+        self.ensure_one()
+
+        if self.treaty_type != 'aggregate':
+            return self._split_claim_amount(amount)
+
+        accumulator = self.env['insurance.reinsurance.accumulator'].sudo()._get_locked(
+            self, period_year
+        )
+        reinsurer_share = self._aggregate_layer_share(
+            accumulator.cumulative_loss,
+            amount,
+            self.aggregate_retention_amount,
+            self.aggregate_limit_amount,
+        )
+        accumulator._adjust(loss_delta=amount, ceded_delta=reinsurer_share)
+
+        return amount - reinsurer_share, reinsurer_share
+
+    def _release_claim_cession(self, claim):
+        """
+        Reverse an approved claim's contribution to the accumulator.
+        """
+        self.ensure_one()
+
+        if self.treaty_type != 'aggregate' or not claim.approved_date:
+            return
+
+        accumulator = self.env['insurance.reinsurance.accumulator'].sudo()._get_locked(
+            self, claim.approved_date.year
+        )
+        accumulator._adjust(
+            loss_delta=-(claim.ceded_base_amount or 0.0),
+            ceded_delta=-(claim.reinsurer_share or 0.0),
+        )
+
+    # ----------------------------
+    # WHAT-IF SIMULATION
+    # ----------------------------
+
+    def _load_simulation_amounts(self, date_from=None, date_to=None):
+        """
+        Insurer-side amounts (before reinsurance) of the policy's approved
+        claims in approval order, as float64 amounts and int32 approval
+        years, fetched in large chunks.
+        """
+        self.ensure_one()
+
+        claim_model = self.env['insurance.claim']
+        claim_model.flush_model([
+            'policy_id', 'state', 'approved_date',
+            'ceded_base_amount', 'insurer_share', 'reinsurer_share',
+        ])
+
+        self.env.cr.execute(
+            """
+            SELECT COALESCE(
+                       NULLIF(ceded_base_amount, 0.0),
+                       COALESCE(insurer_share, 0.0) + COALESCE(reinsurer_share, 0.0)
+                   ),
+                   EXTRACT(YEAR FROM approved_date)::integer
+            FROM insurance_claim
+            WHERE policy_id = %s
+              AND state = 'approved'
+              AND approved_date::date >= %s
+              AND approved_date::date <= %s
+            ORDER BY approved_date, id
+            """,
+            (
+                self.policy_id.id,
+                date_from or self.start_date,
+                date_to or self.end_date,
+            ),
+        )
+
+        amount_chunks, year_chunks = [], []
+        while True:
+            rows = self.env.cr.fetchmany(SIMULATION_FETCH_SIZE)
+            if not rows:
+                break
+            amount_chunks.append(
+                np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+            )
+            year_chunks.append(
+                np.fromiter((row[1] for row in rows), dtype=np.int32, count=len(rows))
+            )
+
+        if not amount_chunks:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int32)
+        return np.concatenate(amount_chunks), np.concatenate(year_chunks)
+
+    @api.model
+    def _simulate_split(self, amounts, retention_amounts, max_coverage_amounts):
+        """
+        Evaluate the ``_split_claim_amount`` rule for every retention/cap
+        pair at once. Claims are sorted once and prefix-summed, so each
+        scenario costs two binary searches instead of a pass over the
+        claims. A cap of 0 means unlimited, as on the contract.
+        """
+        amounts = np.sort(np.asarray(amounts, dtype=np.float64))
+        retentions = np.asarray(retention_amounts, dtype=np.float64)[:, None]
+        caps = np.asarray(max_coverage_amounts, dtype=np.float64)[None, :]
+
+        count = amounts.size
+        prefix = np.concatenate(([0.0], np.cumsum(amounts)))
+
+        unlimited = caps <= 0
+        upper = np.where(unlimited, np.inf, retentions + caps)
+
+        # claims up to the retention / fully inside the layer
+        above_retention = np.searchsorted(amounts, retentions, side='right')
+        inside_layer = np.searchsorted(amounts, upper, side='right')
+
+        layer_count = inside_layer - above_retention
+        ceded = (
+            prefix[inside_layer]
+            - prefix[above_retention]
+            - retentions * layer_count
+            + np.where(unlimited, 0.0, caps) * (count - inside_layer)
+        )
+        retained = prefix[above_retention] + retentions * (count - above_retention)
+        total = prefix[-1]
+
+        results = []
+        for r_index, retention in enumerate(retentions[:, 0]):
+            for c_index, cap in enumerate(caps[0]):
+                results.append({
+                    'retention_amount': float(retention),
+                    'max_coverage_amount': float(cap),
+                    'claim_count': int(count),
+                    'ceded_claim_count': int(count - above_retention[r_index, 0]),
+                    'total_amount': float(total),
+                    'retained_amount': float(retained[r_index, 0]),
+                    'ceded_amount': float(ceded[r_index, c_index]),
+                    'uncovered_amount': float(
+                        total - retained[r_index, 0] - ceded[r_index, c_index]
+                    ),
+                })
+        return results
+
+    @api.model
+    def _simulate_aggregate_split(self, amounts, years, retention_amounts, limit_amounts):
+        """
+        Vectorized twin of the aggregate stop-loss rule. ``amounts`` must
+        be in approval order. Per year, ceded = clip(total - retention,
+        0, limit); a claim is ceded when its running-total span overlaps
+        the layer, found by binary search on the running totals.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        years = np.asarray(years)
+        retentions = np.asarray(retention_amounts, dtype=np.float64)[:, None]
+        limits = np.asarray(limit_amounts, dtype=np.float64)[None, :]
+        top = np.where(limits <= 0, np.inf, retentions + limits)
+
+        ceded = np.zeros(np.broadcast(retentions, limits).shape)
+        ceded_count = np.zeros(ceded.shape, dtype=np.int64)
+
+        for year in np.unique(years):
+            year_amounts = amounts[years == year]
+            running_end = np.cumsum(year_amounts)
+            running_start = running_end - year_amounts
+            total = running_end[-1]
+
+            ceded += np.clip(np.minimum(total, top) - retentions, 0.0, None)
+            ceded_count += np.searchsorted(running_start, top, side='left') - np.searchsorted(
+                running_end, retentions, side='right'
+            )
+
+        total = float(amounts.sum())
+        results = []
+        for r_index, retention in enumerate(retentions[:, 0]):
+            for c_index, limit in enumerate(limits[0]):
+                results.append({
+                    'retention_amount': float(retention),
+                    'max_coverage_amount': float(limit),
+                    'claim_count': int(amounts.size),
+                    'ceded_claim_count': int(max(ceded_count[r_index, c_index], 0)),
+                    'total_amount': total,
+                    'retained_amount': total - float(ceded[r_index, c_index]),
+                    'ceded_amount': float(ceded[r_index, c_index]),
+                    'uncovered_amount': 0.0,
+                })
+        return results
+
+    def simulate_treaty(self, retention_amounts, max_coverage_amounts,
+                        date_from=None, date_to=None):
+        """
+        What-if: how historical approved claims of the policy would have
+        been split under each retention / max coverage combination, using
+        the contract's treaty type. Returns one dict of totals per
+        scenario.
+        """
+        self.ensure_one()
+
+        amounts, years = self._load_simulation_amounts(date_from, date_to)
+        if self.treaty_type == 'aggregate':
+            return self._simulate_aggregate_split(
+                amounts, years, retention_amounts, max_coverage_amounts
+            )
+        return self._simulate_split(amounts, retention_amounts, max_coverage_amounts)
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
@@ -43,6 +45,16 @@ class InsuranceReinsuranceSettlement(models.Model):
         readonly=True,
     )
 
+    total_claims = fields.Integer(
+        string='Ceded Claims',
+        readonly=True,
+    )
+
+    total_approved_amount = fields.Float(
+        string='Total Approved Amount',
+        readonly=True,
+    )
+
     # -----------------------------
     # RELATIONS
     # -----------------------------
@@ -84,9 +96,144 @@ class InsuranceReinsuranceSettlement(models.Model):
         return super().create(vals_list)
 
 
+    # -----------------------------
+    # BUILDER
+    # -----------------------------
+    def _get_eligible_bordereau_domain(self):
+        self.ensure_one()
+        return [
+            ('reinsurance_contract_id', '=', self.reinsurance_contract_id.id),
+            ('state', '=', 'confirmed'),
+            ('settlement_id', '=', False),
+            ('period_start', '>=', self.period_start),
+            ('period_end', '<=', self.period_end),
+        ]
+
+    def _attach_bordereaux(self):
+        """
+        Link every confirmed, unsettled bordereau of the contract and
+        period with one bulk write per settlement.
+        """
+        Bordereau = self.env['insurance.reinsurance.bordereau']
+
+        for rec in self:
+            if rec.state != 'draft':
+                raise ValidationError("Only draft settlements can collect bordereaux.")
+
+            bordereaux = Bordereau.search(rec._get_eligible_bordereau_domain())
+            bordereaux.write({'settlement_id': rec.id})
+
+        self._update_ceded_totals()
+
+    def _update_ceded_totals(self):
+        """
+        Ceded totals from a single aggregate over the bordereau lines.
+        """
+        if not self:
+            return
+
+        self.env['insurance.reinsurance.bordereau'].flush_model(['settlement_id'])
+        self.env['insurance.reinsurance.bordereau.line'].flush_model()
+        self.env.cr.execute(
+            """
+            SELECT b.settlement_id,
+                   COUNT(l.id),
+                   COALESCE(SUM(l.approved_amount), 0.0),
+                   COALESCE(SUM(l.reinsurer_share), 0.0)
+            FROM insurance_reinsurance_bordereau b
+            JOIN insurance_reinsurance_bordereau_line l ON l.bordereau_id = b.id
+            WHERE b.settlement_id IN %s
+            GROUP BY b.settlement_id
+            """,
+            (tuple(self.ids),),
+        )
+        totals = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+        for rec in self:
+            count, approved, ceded = totals.get(rec.id, (0, 0.0, 0.0))
+            rec.write({
+                'total_claims': count,
+                'total_approved_amount': approved,
+                'total_ceded_amount': ceded,
+            })
+
+    @api.model
+    def _build_settlements(self, contracts, period_start, period_end, autocommit=False):
+        """
+        Settle each contract that has confirmed, unsettled bordereaux in
+        the period: they join the period's draft settlement, or a new one
+        if there is none (e.g. bordereaux confirmed after the first
+        settlement was confirmed). Each contract is handled (and, with
+        ``autocommit``, committed) on its own.
+        """
+        Bordereau = self.env['insurance.reinsurance.bordereau']
+        settlements = self.browse()
+
+        for contract in contracts:
+            has_bordereaux = Bordereau.search_count([
+                ('reinsurance_contract_id', '=', contract.id),
+                ('state', '=', 'confirmed'),
+                ('settlement_id', '=', False),
+                ('period_start', '>=', period_start),
+                ('period_end', '<=', period_end),
+            ], limit=1)
+            if not has_bordereaux:
+                continue
+
+            settlement = self.search([
+                ('reinsurance_contract_id', '=', contract.id),
+                ('period_start', '=', period_start),
+                ('period_end', '=', period_end),
+                ('state', '=', 'draft'),
+            ], limit=1)
+            if not settlement:
+                settlement = self.create({
+                    'reinsurance_contract_id': contract.id,
+                    'period_start': period_start,
+                    'period_end': period_end,
+                })
+            settlement._attach_bordereaux()
+            settlements |= settlement
+
+            if autocommit:
+                self.env.cr.commit()
+
+        return settlements
+
+    @api.model
+    def cron_build_settlements(self):
+        """
+        Daily cron: settle every closed quarter that still has confirmed,
+        unsettled bordereaux, so neither the cron's start date nor a late
+        confirmation can leave a bordereau behind.
+        """
+        current_quarter = fields.Date.start_of(fields.Date.today(), 'quarter')
+
+        pending = defaultdict(lambda: self.env['insurance.reinsurance.contract'])
+        for quarter, contract in self.env['insurance.reinsurance.bordereau']._read_group(
+            [
+                ('state', '=', 'confirmed'),
+                ('settlement_id', '=', False),
+                ('period_end', '<', current_quarter),
+            ],
+            ['period_start:quarter', 'reinsurance_contract_id'],
+        ):
+            pending[quarter] |= contract
+
+        for quarter, contracts in sorted(pending.items()):
+            self._build_settlements(
+                contracts,
+                quarter,
+                fields.Date.end_of(quarter, 'quarter'),
+                autocommit=True,
+            )
+
     # -----------------------------
     # ACTIONS
     # -----------------------------
+    def action_collect_bordereaux(self):
+        self._attach_bordereaux()
+
     def action_confirm(self):
         for rec in self:
             if not rec.bordereau_ids:
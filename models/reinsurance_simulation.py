@@ -0,0 +1,86 @@
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+
+class InsuranceReinsuranceSimulation(models.TransientModel):
+    _name = 'insurance.reinsurance.simulation'
+    _description = 'Reinsurance Treaty Simulation'
+
+    reinsurance_contract_id = fields.Many2one(
+        'insurance.reinsurance.contract',
+        string='Reinsurance Contract',
+        required=True,
+    )
+
+    date_from = fields.Date(string='Claims From')
+    date_to = fields.Date(string='Claims To')
+
+    retention_values = fields.Char(
+        string='Retention Amounts',
+        required=True,
+        help='Comma-separated retention amounts to evaluate',
+    )
+
+    max_coverage_values = fields.Char(
+        string='Max Coverage Amounts',
+        default='0',
+        help='Comma-separated reinsurer caps to evaluate (0 = unlimited)',
+    )
+
+    line_ids = fields.One2many(
+        'insurance.reinsurance.simulation.line',
+        'simulation_id',
+        string='Scenarios',
+        readonly=True,
+    )
+
+    @api.model
+    def _parse_amounts(self, value):
+        try:
+            amounts = [float(v) for v in (value or '').split(',') if v.strip()]
+        except ValueError:
+            raise ValidationError("Amounts must be comma-separated numbers.")
+        if not amounts:
+            raise ValidationError("At least one amount is required.")
+        return amounts
+
+    def action_run(self):
+        self.ensure_one()
+
+        results = self.reinsurance_contract_id.simulate_treaty(
+            self._parse_amounts(self.retention_values),
+            self._parse_amounts(self.max_coverage_values),
+            date_from=self.date_from,
+            date_to=self.date_to,
+        )
+
+        self.line_ids = [(5, 0, 0)] + [(0, 0, result) for result in results]
+
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+
+class InsuranceReinsuranceSimulationLine(models.TransientModel):
+    _name = 'insurance.reinsurance.simulation.line'
+    _description = 'Reinsurance Treaty Simulation Scenario'
+    _order = 'retention_amount, max_coverage_amount'
+
+    simulation_id = fields.Many2one(
+        'insurance.reinsurance.simulation',
+        required=True,
+        ondelete='cascade',
+    )
+
+    retention_amount = fields.Float(string='Retention')
+    max_coverage_amount = fields.Float(string='Max Coverage')
+    claim_count = fields.Integer(string='Claims')
+    ceded_claim_count = fields.Integer(string='Claims Ceded')
+    total_amount = fields.Float(string='Total')
+    retained_amount = fields.Float(string='Retained')
+    ceded_amount = fields.Float(string='Ceded')
+    uncovered_amount = fields.Float(string='Above Cap')
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from odoo import models, fields
 
 class ResCompany(models.Model):
@@ -13,4 +15,37 @@ class ResCompany(models.Model):
             'account.account',
             string='Default Insurance Claim Expense Account',
             domain=[('account_type', '=', 'expense')],
-        )
\ No newline at end of file
+        )
+
+    insurance_fraud_flag_threshold = fields.Integer(
+        string='Fraud Flag Threshold',
+        default=40,
+        help='Claims whose fraud score reaches this value are flagged '
+        'and escalated to the medical committee.',
+    )
+
+    insurance_sla_calendar_id = fields.Many2one(
+        'resource.calendar',
+        string='Claim SLA Calendar',
+        help='Working calendar (with public holidays) the claim SLA is counted '
+        'on. Leave empty to count SLA hours in wall-clock time.',
+    )
+
+    insurance_sla_hours = fields.Integer(
+        string='Claim SLA (Hours)',
+        default=48,
+    )
+
+    insurance_committee_digest = fields.Boolean(
+        string='Committee Digest Mode',
+        help='Send committee members one periodic digest of new cases '
+        'instead of an activity per claim.',
+    )
+
+    def _get_insurance_sla_deadline(self, start):
+        self.ensure_one()
+
+        hours = self.insurance_sla_hours
+        if not self.insurance_sla_calendar_id:
+            return start + timedelta(hours=hours)
+        return self.insurance_sla_calendar_id._add_sla_hours(start, hours)
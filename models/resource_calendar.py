@@ -0,0 +1,177 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from itertools import accumulate
+
+from odoo import models, fields, api, tools
+
+# Working time is looked up at most this many years ahead of the start
+# before giving up (e.g. a calendar with no attendances).
+SLA_MAX_YEARS = 3
+
+# Changes that alter a calendar's working intervals; anything else
+# (names, sequences, employee time off) leaves the cached intervals valid.
+SLA_CALENDAR_FIELDS = {"attendance_ids", "leave_ids", "tz", "two_weeks_calendar"}
+SLA_LEAVE_FIELDS = {"date_from", "date_to", "calendar_id", "resource_id", "time_type", "company_id"}
+ATTENDANCE_COSMETIC_FIELDS = {"name", "sequence"}
+
+
+def _to_timestamp(value):
+    """Naive UTC datetime (ORM convention) to a POSIX timestamp."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_timestamp(value):
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+
+class ResourceCalendar(models.Model):
+    _inherit = "resource.calendar"
+
+    # Part of the SLA interval cache key: bumped whenever the calendar's
+    # working time changes, so stale entries are never looked up again
+    sla_cache_version = fields.Integer(readonly=True, copy=False)
+
+    @tools.ormcache("self.id", "self.sla_cache_version", "year")
+    def _get_sla_intervals(self, year):
+        """
+        Working intervals of a UTC calendar year, holidays excluded, as
+        ``(starts, ends, cumulative_hours)`` tuples of POSIX timestamps.
+        ``cumulative_hours[i]`` is the working time up to ``ends[i]``.
+        """
+        self.ensure_one()
+
+        start = datetime(year, 1, 1, tzinfo=timezone.utc)
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+        intervals = self._work_intervals_batch(start, end)[False]
+
+        starts, ends = [], []
+        for interval_start, interval_end, _records in intervals:
+            starts.append(interval_start.timestamp())
+            ends.append(interval_end.timestamp())
+
+        cumulative = tuple(
+            accumulate((stop - begin) / 3600 for begin, stop in zip(starts, ends))
+        )
+        return tuple(starts), tuple(ends), cumulative
+
+    def _add_sla_hours(self, start, hours):
+        """
+        Return the naive UTC datetime that is ``hours`` working hours
+        after ``start``: two bisects per calendar year crossed.
+        """
+        self.ensure_one()
+
+        moment = _to_timestamp(start)
+        remaining = hours
+
+        for year in range(start.year, start.year + SLA_MAX_YEARS + 1):
+            starts, ends, cumulative = self._get_sla_intervals(year)
+            if not cumulative:
+                continue
+
+            # Working time already elapsed in this year at ``moment``
+            index = bisect_right(ends, moment)
+            if index < len(ends):
+                elapsed = cumulative[index - 1] if index else 0.0
+                elapsed += max(moment - starts[index], 0.0) / 3600
+            else:
+                elapsed = cumulative[-1]
+
+            target = elapsed + remaining
+            if target <= cumulative[-1]:
+                index = bisect_left(cumulative, target)
+                return _from_timestamp(ends[index] - (cumulative[index] - target) * 3600)
+
+            remaining = target - cumulative[-1]
+            moment = datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp()
+
+        # No working time configured: fall back to wall-clock hours
+        return _from_timestamp(_to_timestamp(start) + hours * 3600)
+
+    # -------------------------------------------------
+    # CACHE INVALIDATION
+    # -------------------------------------------------
+
+    def _bump_sla_cache_version(self):
+        """Retire the cached SLA intervals of these calendars on all workers."""
+        if not self:
+            return
+        self.env.cr.execute(
+            """
+            UPDATE resource_calendar
+            SET sla_cache_version = sla_cache_version + 1
+            WHERE id IN %s
+            """,
+            [tuple(self.ids)],
+        )
+        self.invalidate_recordset(["sla_cache_version"])
+
+    def write(self, vals):
+        res = super().write(vals)
+        if SLA_CALENDAR_FIELDS.intersection(vals):
+            self._bump_sla_cache_version()
+        return res
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = "resource.calendar.attendance"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.calendar_id._bump_sla_cache_version()
+        return records
+
+    def write(self, vals):
+        if not set(vals) - ATTENDANCE_COSMETIC_FIELDS:
+            return super().write(vals)
+
+        calendars = self.calendar_id
+        res = super().write(vals)
+        (calendars | self.calendar_id)._bump_sla_cache_version()
+        return res
+
+    def unlink(self):
+        calendars = self.calendar_id
+        res = super().unlink()
+        calendars._bump_sla_cache_version()
+        return res
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = "resource.calendar.leaves"
+
+    def _get_sla_calendars(self):
+        """
+        Calendars whose SLA intervals these leaves affect. Leaves of a
+        single resource (employee time off) never do; leaves without a
+        calendar apply to every calendar of their company.
+        """
+        leaves = self.filtered(lambda leave: not leave.resource_id)
+        calendars = leaves.calendar_id
+        if any(not leave.calendar_id for leave in leaves):
+            calendars |= self.env["resource.calendar"].search(
+                [("company_id", "in", leaves.company_id.ids + [False])]
+            )
+        return calendars
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._get_sla_calendars()._bump_sla_cache_version()
+        return records
+
+    def write(self, vals):
+        if not SLA_LEAVE_FIELDS.intersection(vals):
+            return super().write(vals)
+
+        calendars = self._get_sla_calendars()
+        res = super().write(vals)
+        (calendars | self._get_sla_calendars())._bump_sla_cache_version()
+        return res
+
+    def unlink(self):
+        calendars = self._get_sla_calendars()
+        res = super().unlink()
+        calendars._bump_sla_cache_version()
+        return res